@@ -0,0 +1,101 @@
+"""
+__main__.py
+
+Punto de entrada de la suite de benchmarks:
+
+    python -m benchmarks                      # ejecuta y compara con la línea base
+    python -m benchmarks --quick              # solo los puntos pequeños de cada barrido
+    python -m benchmarks --update-baseline    # guarda los resultados como nueva línea base
+
+Termina con código 1 si algún punto supera el umbral de regresión configurado y con código 2 si
+no existe la línea base (salvo con --update-baseline), para que una comparación sin referencia no
+pase por válida.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+
+import numpy as np
+
+from benchmarks.suite import CASES, run_suite, compare
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "baseline.json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmarks de escalamiento de los servicios de los cuatro módulos.")
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES),
+                        help="Servicios a ejecutar (por defecto, todos).")
+    parser.add_argument("--quick", action="store_true",
+                        help="Ejecutar solo los puntos pequeños de cada barrido.")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Repeticiones cronometradas por punto (por defecto 3).")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="Archivo JSON de la línea base.")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Guardar los resultados como línea base en lugar de comparar.")
+    parser.add_argument("--threshold", type=float,
+                        default=float(os.environ.get("ZEH_BENCH_THRESHOLD", 0.25)),
+                        help="Aumento relativo de tiempo tolerado (por defecto 0.25).")
+    parser.add_argument("--memory-threshold", type=float,
+                        default=float(os.environ.get("ZEH_BENCH_MEMORY_THRESHOLD", 0.5)),
+                        help="Aumento relativo de memoria tolerado (por defecto 0.5).")
+    parser.add_argument("--output", help="Archivo JSON donde guardar los resultados.")
+    args = parser.parse_args(argv)
+
+    resultados = run_suite(only=args.only, quick=args.quick, repeat=args.repeat,
+                           report=lambda linea: print(linea, file=sys.stderr))
+    documento = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "repeat": args.repeat,
+        },
+        "results": resultados,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as archivo:
+            json.dump(documento, archivo, indent=2, ensure_ascii=False)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        # Conservar los puntos de la línea base que no se ejecutaron en esta corrida
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as archivo:
+                anterior = json.load(archivo)["results"]
+            for servicio, puntos in resultados.items():
+                anterior.setdefault(servicio, {}).update(puntos)
+            documento["results"] = anterior
+        with open(args.baseline, "w", encoding="utf-8") as archivo:
+            json.dump(documento, archivo, indent=2, ensure_ascii=False)
+        print(f"Línea base guardada en {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No existe la línea base {args.baseline}; ejecuta con --update-baseline "
+              "para crearla.", file=sys.stderr)
+        return 2
+
+    with open(args.baseline, encoding="utf-8") as archivo:
+        baseline = json.load(archivo)["results"]
+    regresiones = compare(resultados, baseline, threshold=args.threshold,
+                          memory_threshold=args.memory_threshold)
+    if regresiones:
+        print("Regresiones detectadas:", file=sys.stderr)
+        for regresion in regresiones:
+            print(f"  - {regresion}", file=sys.stderr)
+        return 1
+
+    print("Sin regresiones respecto a la línea base.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
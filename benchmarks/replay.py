@@ -0,0 +1,273 @@
+"""
+replay.py
+
+Este módulo implementa el arnés de carga HTTP que reproduce las solicitudes de ejemplo del
+repositorio.
+
+Las solicitudes se toman de la colección de Postman (`ZEH Examples.postman_collection.json`) y,
+opcionalmente, de archivos JSONL con un registro por línea (`{"method", "path", "body"}`; las
+líneas sin `path` se ignoran). Con ellas se arma una mezcla ponderada que se envía a la aplicación
+en proceso (cliente de pruebas de Flask) o a un servidor local, con la concurrencia indicada.
+
+Uso:
+    python -m benchmarks.replay --requests 200 --concurrency 8
+    python -m benchmarks.replay --url http://localhost:5000 --duration 60 --weight "Modulo 3 Locall Copy=4"
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+DEFAULT_COLLECTION = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  "ZEH Examples.postman_collection.json")
+
+
+def load_postman(path):
+    """
+    Extrae las solicitudes de una colección de Postman (formato v2.1), incluidas las carpetas.
+
+    Args:
+        path (str): Ruta del archivo de la colección.
+
+    Returns:
+        list[dict]: Solicitudes con `name`, `method`, `path` y `body`.
+    """
+    with open(path, encoding="utf-8") as archivo:
+        coleccion = json.load(archivo)
+
+    solicitudes = []
+
+    def recorrer(items):
+        for item in items:
+            if "item" in item:
+                recorrer(item["item"])
+                continue
+            req = item.get("request", {})
+            url = req.get("url", {})
+            if isinstance(url, dict):
+                ruta = "/" + "/".join(url.get("path", []))
+            else:
+                ruta = "/" + url.split("://", 1)[-1].split("/", 1)[-1]
+            cuerpo = None
+            raw = req.get("body", {}).get("raw")
+            if raw:
+                cuerpo = json.loads(raw)
+            solicitudes.append({
+                "name": item.get("name", ruta),
+                "method": req.get("method", "GET"),
+                "path": ruta,
+                "body": cuerpo,
+            })
+
+    recorrer(coleccion.get("item", []))
+    return solicitudes
+
+
+def load_jsonl(path):
+    """
+    Extrae solicitudes de un archivo JSONL. Las líneas sin `path` se ignoran.
+
+    Args:
+        path (str): Ruta del archivo.
+
+    Returns:
+        list[dict]: Solicitudes con `name`, `method`, `path` y `body`.
+    """
+    solicitudes = []
+    with open(path, encoding="utf-8") as archivo:
+        for linea in archivo:
+            linea = linea.strip()
+            if not linea:
+                continue
+            registro = json.loads(linea)
+            if "path" not in registro:
+                continue
+            solicitudes.append({
+                "name": registro.get("name", registro["path"]),
+                "method": registro.get("method", "POST"),
+                "path": registro["path"],
+                "body": registro.get("body"),
+            })
+    return solicitudes
+
+
+class InProcessDriver:
+    """Envía las solicitudes a la aplicación Flask en proceso mediante su cliente de pruebas."""
+
+    def __init__(self):
+        from src import init_app
+        self.app = init_app()
+        self._local = threading.local()
+
+    def send(self, solicitud):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        respuesta = client.open(solicitud["path"], method=solicitud["method"],
+                                json=solicitud["body"])
+        return respuesta.status_code
+
+
+class HttpDriver:
+    """Envía las solicitudes a un servidor HTTP."""
+
+    def __init__(self, base_url, timeout=120):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def send(self, solicitud):
+        datos = None
+        headers = {}
+        if solicitud["body"] is not None:
+            datos = json.dumps(solicitud["body"]).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        req = urllib.request.Request(self.base_url + solicitud["path"], data=datos,
+                                     headers=headers, method=solicitud["method"])
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as respuesta:
+                respuesta.read()
+                return respuesta.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+
+def replay(driver, mezcla, pesos, concurrency=4, total=None, duration=None, seed=0):
+    """
+    Reproduce una mezcla de solicitudes con la concurrencia indicada.
+
+    Se detiene al alcanzar `total` solicitudes o al cumplirse `duration` segundos (lo primero).
+
+    Args:
+        driver: Objeto con un método `send(solicitud) -> int` (código HTTP).
+        mezcla (list[dict]): Solicitudes disponibles.
+        pesos (list[float]): Peso relativo de cada solicitud.
+        concurrency (int): Número de clientes concurrentes.
+        total (int, optional): Número total de solicitudes.
+        duration (float, optional): Duración máxima en segundos.
+        seed (int): Semilla para la selección de solicitudes.
+
+    Returns:
+        tuple: Lista de muestras `(path, segundos, ok)` y tiempo total transcurrido.
+    """
+    muestras = []
+    lock = threading.Lock()
+    enviados = [0]
+    inicio = time.perf_counter()
+    limite = inicio + duration if duration else None
+
+    def trabajador(indice):
+        rng = random.Random(seed + indice)
+        while True:
+            with lock:
+                if total is not None and enviados[0] >= total:
+                    return
+                enviados[0] += 1
+            if limite is not None and time.perf_counter() >= limite:
+                return
+            solicitud = rng.choices(mezcla, weights=pesos)[0]
+            t0 = time.perf_counter()
+            try:
+                ok = driver.send(solicitud) < 400
+            except Exception:
+                ok = False
+            with lock:
+                muestras.append((solicitud["path"], time.perf_counter() - t0, ok))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(trabajador, range(concurrency)))
+    return muestras, time.perf_counter() - inicio
+
+
+def summarize(muestras, elapsed):
+    """
+    Resume las muestras por endpoint.
+
+    Returns:
+        dict: Por endpoint, número de solicitudes, rendimiento (req/s), tasa de error y latencias
+        p50/p95/p99 en milisegundos.
+    """
+    por_endpoint = {}
+    for path, segundos, ok in muestras:
+        por_endpoint.setdefault(path, []).append((segundos, ok))
+
+    resumen = {}
+    for path, valores in sorted(por_endpoint.items()):
+        latencias = np.array([v[0] for v in valores]) * 1000
+        errores = sum(1 for v in valores if not v[1])
+        p50, p95, p99 = np.percentile(latencias, [50, 95, 99])
+        resumen[path] = {
+            "requests": len(valores),
+            "throughput_rps": len(valores) / elapsed if elapsed else 0.0,
+            "error_rate": errores / len(valores),
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+        }
+    return resumen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.replay",
+        description="Reproduce bajo carga las solicitudes de ejemplo de la API.")
+    parser.add_argument("--collection", default=DEFAULT_COLLECTION,
+                        help="Colección de Postman de la que tomar las solicitudes.")
+    parser.add_argument("--jsonl", nargs="*", default=[],
+                        help="Archivos JSONL adicionales con solicitudes.")
+    parser.add_argument("--url", help="URL base de un servidor. Sin ella se usa la aplicación en proceso.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Clientes concurrentes.")
+    parser.add_argument("--requests", type=int, help="Número total de solicitudes.")
+    parser.add_argument("--duration", type=float, help="Duración máxima en segundos.")
+    parser.add_argument("--weight", action="append", default=[], metavar="NOMBRE=PESO",
+                        help="Peso relativo de una solicitud por su nombre (por defecto 1).")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla de la mezcla.")
+    parser.add_argument("--output", help="Archivo JSON donde guardar el resumen.")
+    args = parser.parse_args(argv)
+
+    mezcla = load_postman(args.collection) if args.collection else []
+    for ruta in args.jsonl:
+        mezcla.extend(load_jsonl(ruta))
+    if not mezcla:
+        parser.error("No se encontraron solicitudes para reproducir.")
+
+    pesos_por_nombre = {}
+    for entrada in args.weight:
+        nombre, _, peso = entrada.rpartition("=")
+        pesos_por_nombre[nombre] = float(peso)
+    pesos = [pesos_por_nombre.get(s["name"], 1.0) for s in mezcla]
+
+    total = args.requests
+    if total is None and args.duration is None:
+        total = 100
+
+    driver = HttpDriver(args.url) if args.url else InProcessDriver()
+    muestras, elapsed = replay(driver, mezcla, pesos, concurrency=args.concurrency,
+                               total=total, duration=args.duration, seed=args.seed)
+    resumen = summarize(muestras, elapsed)
+
+    print(f"{'endpoint':<24} {'req':>6} {'req/s':>8} {'error':>7} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for path, r in resumen.items():
+        print(f"{path:<24} {r['requests']:>6} {r['throughput_rps']:>8.2f} "
+              f"{r['error_rate']:>7.1%} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f}")
+    print(f"total: {len(muestras)} solicitudes en {elapsed:.2f} s "
+          f"({len(muestras) / elapsed:.2f} req/s, concurrencia {args.concurrency})")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as archivo:
+            json.dump({"elapsed_s": elapsed, "concurrency": args.concurrency,
+                       "endpoints": resumen}, archivo, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
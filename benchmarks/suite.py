@@ -0,0 +1,205 @@
+"""
+suite.py
+
+Este módulo define los barridos de escalamiento de los cuatro servicios y las funciones para
+medirlos y compararlos con una línea base.
+
+Cada caso llama directamente a la función del servicio (sin Flask) con una semilla fija y registra
+el mejor tiempo de varias repeticiones y el pico de memoria asignada por Python (`tracemalloc`).
+El pico de memoria no incluye procesos externos como el solver CBC del módulo 1.
+"""
+
+from contextlib import contextmanager
+import os
+import sys
+import time
+import tracemalloc
+
+from src.services.model_1_services import run_optimization, screen_sizing
+from src.services.model_2_services import optimize_solar_energy, simulate_solar_ensemble
+from src.services.model_3_services import run_monte_carlo_simulation
+from src.services.model_4_services import run_prediction
+
+SEED = 42
+
+ELECTRODOMESTICOS = {
+    "Aire acondicionado": 1.5,
+    "Televisor": 0.1,
+    "Refrigeradora": 1.2,
+    "Bombillas LED": 0.01,
+    "Lavadora": 0.5,
+    "Secadora": 2.0,
+    "Microondas": 0.9,
+    "Computadora de escritorio": 0.2,
+    "Cargador de teléfono": 0.01
+}
+
+
+def _modulo1(K, servicio=run_optimization):
+    return lambda: servicio({
+        "K": K, "c1": 100, "c2": 500, "c3": 0.05, "c4": 0.25, "gamma": 0.90,
+        "r": 0.2, "X_max": 20, "generacion_solar": [5.0] * K,
+        "consumo_energia": [10.0] * K, "seed": SEED
+    })
+
+
+def _modulo2(horas_sol):
+    return lambda: optimize_solar_energy({
+        "A": 10, "eta": 0.20, "I_promedio": 5.5, "horas_sol": horas_sol, "seed": SEED
+    })
+
+
+def _ensamble(num_realizaciones):
+    return lambda: simulate_solar_ensemble({
+        "A": 10, "eta": 0.20, "I_promedio": 5.5, "horas_sol": 12, "seed": SEED,
+        "num_realizaciones": num_realizaciones
+    })
+
+
+def _modulo3(num_simulaciones):
+    return lambda: run_monte_carlo_simulation(
+        num_simulaciones, (0.05, 0.15), (3, 7), (10, 30), 5, "SIERRA", 80, 150, seed=SEED)
+
+
+def _modulo4(dias_historicos, orden_arima):
+    return lambda: run_prediction({
+        "electrodomesticos": ELECTRODOMESTICOS, "dias_historicos": dias_historicos,
+        "orden_arima": list(orden_arima), "intervalo_confianza": 0.95, "seed": SEED
+    })
+
+
+# Barridos por servicio: (nombre del punto, función sin argumentos, incluido en modo rápido)
+CASES = {
+    "run_optimization": [
+        (f"K={K}", _modulo1(K), K <= 30) for K in (7, 30, 90, 365)
+    ],
+    "screen_sizing": [
+        (f"K={K}", _modulo1(K, screen_sizing), K <= 365) for K in (30, 365, 8760)
+    ],
+    "optimize_solar_energy": [
+        (f"horas_sol={h}", _modulo2(h), h <= 12) for h in (6, 12, 18)
+    ],
+    "simulate_solar_ensemble": [
+        (f"num_realizaciones={n}", _ensamble(n), n <= 100_000) for n in (1_000, 100_000, 1_000_000)
+    ],
+    "run_monte_carlo_simulation": [
+        (f"num_simulaciones={n}", _modulo3(n), n <= 10_000) for n in (1_000, 10_000, 100_000)
+    ],
+    "run_prediction": [
+        (f"dias_historicos={d},orden_arima=5-1-0", _modulo4(d, (5, 1, 0)), d <= 90)
+        for d in (30, 90, 365)
+    ] + [
+        (f"dias_historicos=90,orden_arima={'-'.join(map(str, o))}", _modulo4(90, o), False)
+        for o in ((1, 1, 0), (2, 1, 2))
+    ],
+}
+
+
+@contextmanager
+def _silenciar_stdout():
+    """Redirige el descriptor de salida estándar (el solver CBC escribe directamente en él)."""
+    sys.stdout.flush()
+    original = os.dup(1)
+    nulo = os.open(os.devnull, os.O_WRONLY)
+    try:
+        os.dup2(nulo, 1)
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(original, 1)
+        os.close(nulo)
+        os.close(original)
+
+
+def measure(func, repeat=3):
+    """
+    Mide una función.
+
+    Args:
+        func (callable): Función sin argumentos.
+        repeat (int): Número de repeticiones cronometradas.
+
+    Returns:
+        dict: Mejor tiempo (`time_s`), mediana (`median_s`) y pico de memoria (`peak_mem_mb`).
+    """
+    tiempos = []
+    with _silenciar_stdout():
+        for _ in range(repeat):
+            inicio = time.perf_counter()
+            func()
+            tiempos.append(time.perf_counter() - inicio)
+
+        # El pico de memoria se mide en una ejecución aparte para no distorsionar los tiempos
+        tracemalloc.start()
+        try:
+            func()
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    tiempos.sort()
+    return {
+        "time_s": tiempos[0],
+        "median_s": tiempos[len(tiempos) // 2],
+        "peak_mem_mb": pico / 2 ** 20,
+    }
+
+
+def run_suite(only=None, quick=False, repeat=3, report=print):
+    """
+    Ejecuta los barridos.
+
+    Args:
+        only (list[str], optional): Servicios a ejecutar. Por defecto, todos.
+        quick (bool): Si solo se ejecutan los puntos pequeños de cada barrido.
+        repeat (int): Repeticiones cronometradas por punto.
+        report (callable): Función que recibe una línea de progreso.
+
+    Returns:
+        dict: Resultados por servicio y punto.
+    """
+    resultados = {}
+    for servicio, casos in CASES.items():
+        if only and servicio not in only:
+            continue
+        resultados[servicio] = {}
+        for nombre, func, rapido in casos:
+            if quick and not rapido:
+                continue
+            medida = measure(func, repeat=repeat)
+            resultados[servicio][nombre] = medida
+            report(f"{servicio:<28} {nombre:<40} {medida['time_s'] * 1000:>10.1f} ms "
+                   f"{medida['peak_mem_mb']:>9.2f} MB")
+    return resultados
+
+
+def compare(resultados, baseline, threshold=0.25, memory_threshold=0.5):
+    """
+    Compara resultados con una línea base.
+
+    Solo se comparan los puntos presentes en ambos conjuntos.
+
+    Args:
+        resultados (dict): Resultados de `run_suite`.
+        baseline (dict): Resultados de referencia con la misma estructura.
+        threshold (float): Aumento relativo de tiempo tolerado (0.25 = 25 %).
+        memory_threshold (float): Aumento relativo de memoria tolerado.
+
+    Returns:
+        list[str]: Descripción de cada regresión encontrada.
+    """
+    regresiones = []
+    for servicio, puntos in resultados.items():
+        for nombre, medida in puntos.items():
+            referencia = baseline.get(servicio, {}).get(nombre)
+            if referencia is None:
+                continue
+            for clave, limite in (("time_s", threshold), ("peak_mem_mb", memory_threshold)):
+                if referencia[clave] <= 0:
+                    continue
+                cambio = medida[clave] / referencia[clave] - 1
+                if cambio > limite:
+                    regresiones.append(
+                        f"{servicio} [{nombre}] {clave}: {referencia[clave]:.4g} -> "
+                        f"{medida[clave]:.4g} (+{cambio:.0%}, límite +{limite:.0%})")
+    return regresiones
@@ -0,0 +1,60 @@
+"""
+serve.py
+
+Punto de entrada del servidor de producción. Sirve la aplicación con Waitress (servidor WSGI
+multihilo) y ejecuta las llamadas a los modelos en el pool de procesos de trabajo de
+`src.utils.executor`, de modo que el rendimiento escala con los núcleos disponibles.
+
+Uso:
+    python serve.py
+    python serve.py --port 8000 --workers 4 --max-tasks 100
+"""
+
+import argparse
+import os
+import signal
+import sys
+
+from waitress import serve
+
+from src import init_app
+from src.utils.executor import process_backend
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python serve.py",
+        description="Servidor de producción de la API con procesos de trabajo para los modelos.")
+    parser.add_argument("--host", default=os.environ.get("ZEH_HOST", "0.0.0.0"),
+                        help="Dirección en la que escuchar.")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("ZEH_PORT", 5000)),
+                        help="Puerto en el que escuchar.")
+    parser.add_argument("--workers", type=int,
+                        default=int(os.environ.get("ZEH_WORKER_PROCESSES", os.cpu_count() or 1)),
+                        help="Procesos de trabajo para los modelos (0 para usar los hilos del servidor).")
+    parser.add_argument("--max-tasks", type=int,
+                        default=int(os.environ.get("ZEH_WORKER_MAX_TASKS", 200)),
+                        help="Tareas por proceso antes de reemplazarlo (0 para no reemplazarlos).")
+    parser.add_argument("--threads", type=int, default=int(os.environ.get("ZEH_SERVER_THREADS", 0)),
+                        help="Hilos del servidor HTTP (por defecto, el doble de procesos y al menos 8).")
+    args = parser.parse_args(argv)
+
+    # Configurar el backend antes de crear la aplicación y precalentar los procesos
+    process_backend.processes = args.workers
+    process_backend.max_tasks = args.max_tasks
+    app = init_app()
+    process_backend.start()
+
+    # Los hilos del servidor solo esperan a los procesos, así que conviene que haya más hilos
+    hilos = args.threads or max(8, 2 * args.workers)
+    # Convertir SIGTERM (por ejemplo, `docker stop`) en una salida ordenada que detenga los procesos
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        serve(app, host=args.host, port=args.port, threads=hilos)
+    finally:
+        process_backend.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
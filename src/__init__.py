@@ -8,6 +8,11 @@ incluyendo el registro de blueprints y la configuración de CORS.
 from flask import Flask  # Clase principal para crear aplicaciones Flask
 from flask_cors import CORS  # Habilitar CORS (Cross-Origin Resource Sharing)
 from src.routes import model_1_routes, model_2_routes, model_3_routes, model_4_routes # Importa las rutas del modelo
+from src.routes import pipeline_routes  # Ruta del pipeline de planificación
+from src.routes import jobs_routes  # Rutas de trabajos asíncronos
+from src.routes import cache_routes  # Rutas de la caché de respuestas
+from src.routes import metrics_routes  # Ruta de métricas
+from src.utils.metrics import init_metrics  # Instrumentación de latencia por etapas
 
 
 # Instancia global de la aplicación Flask
@@ -36,6 +41,17 @@ def init_app():
         app.register_blueprint(model_3_routes.monte_carlo, url_prefix='/api/v1/modulo3')
         # Registrar el blueprint del modelo modulo 4 con el prefijo '/solar'
         app.register_blueprint(model_4_routes.main, url_prefix='/api/v1/modulo4')
+        # Registrar el blueprint del pipeline de planificación con el prefijo '/pipeline'
+        app.register_blueprint(pipeline_routes.pipeline, url_prefix='/api/v1/pipeline')
+        # Registrar el blueprint de trabajos asíncronos con el prefijo '/jobs'
+        app.register_blueprint(jobs_routes.jobs, url_prefix='/api/v1/jobs')
+        # Registrar el blueprint de la caché de respuestas con el prefijo '/cache'
+        app.register_blueprint(cache_routes.cache, url_prefix='/api/v1/cache')
+        # Registrar la ruta de métricas en '/metrics'
+        app.register_blueprint(metrics_routes.metrics)
+
+        # Registrar los hooks de medición de latencia por etapas
+        init_metrics(app)
 
         return app  # Devuelve la aplicación configurada
     except Exception as e:
@@ -0,0 +1,43 @@
+"""
+cache_routes.py
+
+Este módulo define las rutas para consultar y vaciar la caché de respuestas de los modelos
+utilizando Flask.
+"""
+
+from flask import Blueprint, jsonify
+from flask_cors import cross_origin
+from src.utils.cache import response_cache
+import logging
+
+# Configurar logger para registrar errores y eventos importantes
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Crear un blueprint para las rutas de la caché
+cache = Blueprint('cache_blueprint', __name__)
+
+
+@cross_origin  # Permitir solicitudes de orígenes cruzados
+@cache.route('/', methods=['GET'])
+def stats():
+    """
+    Ruta GET con los contadores de aciertos y fallos de la caché de respuestas.
+
+    Returns:
+        JSON:
+            - status: "success".
+            - results: Aciertos en memoria y en disco, fallos, proporción de aciertos y tamaño.
+    """
+    return jsonify({"status": "success", "results": response_cache.stats()}), 200
+
+
+@cross_origin  # Permitir solicitudes de orígenes cruzados
+@cache.route('/', methods=['DELETE'])
+def clear():
+    """
+    Ruta DELETE para vaciar el nivel en memoria de la caché y reiniciar sus contadores.
+    """
+    response_cache.clear()
+    logger.info("Caché de respuestas vaciada.")
+    return jsonify({"status": "success", "results": response_cache.stats()}), 200
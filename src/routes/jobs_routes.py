@@ -0,0 +1,155 @@
+"""
+jobs_routes.py
+
+Este módulo define las rutas del subsistema de trabajos asíncronos utilizando Flask.
+Permite enviar la ejecución de cualquiera de los cuatro módulos en segundo plano, consultar su
+progreso y resultado, y cancelarla. Las rutas síncronas de cada módulo no se modifican.
+"""
+
+from flask import Blueprint, request, jsonify, current_app, url_for
+from flask_cors import cross_origin
+from src.routes import model_1_routes, model_2_routes, model_3_routes, model_4_routes, pipeline_routes
+from src.utils.admission import BACKGROUND_ENVIRON_KEY
+from src.utils.jobs import job_manager, JobQueueFullError
+from src.utils.validation import ValidationError
+import logging
+
+# Configurar logger para registrar errores y eventos importantes
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Crear un blueprint para las rutas de trabajos asíncronos
+jobs = Blueprint('jobs_blueprint', __name__)
+
+# Endpoints síncronos que pueden ejecutarse como trabajo, con la ruta que atienden y su esquema
+JOB_VIEWS = {
+    "modulo1": ('optimization_blueprint.optimize', '/api/v1/modulo1/', model_1_routes.SCHEMA),
+    "modulo2": ('solar_blueprint.optimize', '/api/v1/modulo2/', model_2_routes.SCHEMA),
+    "modulo3": ('monte_carlo_blueprint.simulate', '/api/v1/modulo3/', model_3_routes.SCHEMA),
+    "modulo4": ('prediction_blueprint.predict', '/api/v1/modulo4/', model_4_routes.SCHEMA),
+    "pipeline": ('pipeline_blueprint.plan', '/api/v1/pipeline/', pipeline_routes.SCHEMA),
+}
+
+
+def _run_view(app, modulo, payload):
+    """
+    Ejecuta la vista síncrona de un módulo dentro de un contexto de solicitud simulado.
+
+    Se reutilizan así las mismas validaciones y el mismo formato de respuesta que la ruta síncrona.
+
+    Args:
+        app (Flask): Aplicación Flask.
+        modulo (str): Nombre del módulo ('modulo1' ... 'modulo4').
+        payload (dict): JSON enviado por el cliente.
+
+    Returns:
+        dict: Cuerpo JSON de la respuesta y código HTTP equivalente.
+
+    Raises:
+        ValueError: Si la vista responde con un error de validación.
+        RuntimeError: Si la vista responde con un error inesperado.
+    """
+    endpoint, path, _ = JOB_VIEWS[modulo]
+    view = app.view_functions[endpoint]
+    # Los trabajos esperan su turno en el control de admisión en lugar de ser rechazados
+    with app.test_request_context(path, method='POST', json=payload,
+                                  environ_base={BACKGROUND_ENVIRON_KEY: True}):
+        response, status_code = view()
+    body = response.get_json()
+    if status_code >= 500:
+        raise RuntimeError(body.get("message"))
+    if status_code >= 400:
+        raise ValueError(body.get("message"))
+    return body
+
+
+@cross_origin  # Permitir solicitudes de orígenes cruzados
+@jobs.route('/<modulo>', methods=['POST'])
+def submit(modulo):
+    """
+    Ruta POST para enviar un trabajo asíncrono.
+    Espera el mismo JSON que la ruta síncrona del módulo indicado.
+
+    Returns:
+        JSON:
+            - status: "success" si el trabajo se encoló (código 202).
+            - job: Estado inicial del trabajo, incluyendo `job_id`.
+            - status: "error" si el módulo no existe (404), el JSON no cumple el esquema
+              del módulo (400) o la cola está llena (503).
+    """
+    try:
+        if modulo not in JOB_VIEWS:
+            return jsonify({"status": "error", "message": f"Módulo desconocido: {modulo}"}), 404
+
+        data = request.get_json(silent=True)
+        if not data:
+            logger.error("No se proporcionó un JSON válido en la solicitud.")
+            return jsonify({"status": "error", "message": "Solicitud inválida. Asegúrate de enviar un JSON válido."}), 400
+
+        # Validar antes de encolar para responder los errores de inmediato
+        JOB_VIEWS[modulo][2].validate(data)
+
+        app = current_app._get_current_object()
+        job = job_manager.submit(modulo, _run_view, app, modulo, data)
+
+        response = jsonify({"status": "success", "job": job.to_dict()})
+        response.headers['Location'] = url_for('.status', job_id=job.id)
+        return response, 202
+
+    except ValidationError as e:
+        logger.error(f"Error de validación: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    except JobQueueFullError as e:
+        logger.error(str(e))
+        response = jsonify({"status": "error", "message": str(e)})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+
+    except Exception as e:
+        # Capturar errores generales
+        logger.error(f"Error inesperado: {str(e)}")
+        return jsonify({"status": "error", "message": "Ocurrió un error inesperado. Por favor, intenta nuevamente."}), 500
+
+
+@cross_origin  # Permitir solicitudes de orígenes cruzados
+@jobs.route('/<job_id>', methods=['GET'])
+def status(job_id):
+    """
+    Ruta GET para consultar el estado, el progreso y el resultado de un trabajo.
+
+    Returns:
+        JSON:
+            - status: "success" con el estado del trabajo; incluye `result` cuando terminó.
+            - status: "error" si el trabajo no existe o ya expiró (404).
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Trabajo no encontrado o expirado."}), 404
+    return jsonify({"status": "success", "job": job.to_dict()}), 200
+
+
+@cross_origin  # Permitir solicitudes de orígenes cruzados
+@jobs.route('/<job_id>', methods=['DELETE'])
+def cancel(job_id):
+    """
+    Ruta DELETE para cancelar un trabajo en cola o en ejecución.
+
+    Returns:
+        JSON:
+            - status: "success" con el estado del trabajo tras solicitar la cancelación.
+            - status: "error" si el trabajo no existe o ya expiró (404).
+    """
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Trabajo no encontrado o expirado."}), 404
+    return jsonify({"status": "success", "job": job.to_dict(include_result=False)}), 200
+
+
+@cross_origin  # Permitir solicitudes de orígenes cruzados
+@jobs.route('/', methods=['GET'])
+def stats():
+    """
+    Ruta GET con el conteo de trabajos por estado y la configuración del pool.
+    """
+    return jsonify({"status": "success", "results": job_manager.stats()}), 200
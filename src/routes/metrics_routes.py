@@ -0,0 +1,84 @@
+"""
+metrics_routes.py
+
+Este módulo define la ruta `/metrics`, que expone en formato de texto de Prometheus los
+histogramas de latencia por etapa junto con los contadores de la caché y de los trabajos.
+"""
+
+from flask import Blueprint, Response
+from src.utils.metrics import render_metrics, register_collector
+from src.utils.cache import response_cache
+from src.utils.jobs import job_manager
+from src.utils.admission import limiters
+from src.utils.executor import process_backend
+
+# Crear un blueprint para la ruta de métricas
+metrics = Blueprint('metrics_blueprint', __name__)
+
+
+def _cache_metrics():
+    stats = response_cache.stats()
+    return [
+        "# HELP zeh_cache_requests_total Consultas a la caché de respuestas por resultado.",
+        "# TYPE zeh_cache_requests_total counter",
+        f'zeh_cache_requests_total{{result="hit"}} {stats["hits"]}',
+        f'zeh_cache_requests_total{{result="disk_hit"}} {stats["disk_hits"]}',
+        f'zeh_cache_requests_total{{result="miss"}} {stats["misses"]}',
+        "# HELP zeh_cache_entries Entradas en el nivel en memoria de la caché.",
+        "# TYPE zeh_cache_entries gauge",
+        f"zeh_cache_entries {stats['entries']}",
+    ]
+
+
+def _jobs_metrics():
+    stats = job_manager.stats()
+    lineas = ["# HELP zeh_jobs Trabajos asíncronos registrados por estado.",
+              "# TYPE zeh_jobs gauge"]
+    lineas.extend(f'zeh_jobs{{state="{estado}"}} {conteo}'
+                  for estado, conteo in stats["jobs"].items())
+    return lineas
+
+
+def _admission_metrics():
+    stats = {nombre: limiter.stats() for nombre, limiter in limiters.items()}
+    lineas = ["# HELP zeh_admission_in_use Unidades de costo en ejecución por endpoint.",
+              "# TYPE zeh_admission_in_use gauge"]
+    lineas.extend(f'zeh_admission_in_use{{endpoint="{n}"}} {s["in_use"]}' for n, s in stats.items())
+    lineas += ["# HELP zeh_admission_queue_depth Solicitudes en espera de admisión por endpoint.",
+               "# TYPE zeh_admission_queue_depth gauge"]
+    lineas.extend(f'zeh_admission_queue_depth{{endpoint="{n}"}} {s["queued"]}'
+                  for n, s in stats.items())
+    lineas += ["# HELP zeh_admission_admitted_total Solicitudes admitidas por endpoint.",
+               "# TYPE zeh_admission_admitted_total counter"]
+    lineas.extend(f'zeh_admission_admitted_total{{endpoint="{n}"}} {s["admitted"]}'
+                  for n, s in stats.items())
+    lineas += ["# HELP zeh_admission_rejected_total Solicitudes rechazadas (503) por endpoint y motivo.",
+               "# TYPE zeh_admission_rejected_total counter"]
+    lineas.extend(f'zeh_admission_rejected_total{{endpoint="{n}",reason="{motivo}"}} {conteo}'
+                  for n, s in stats.items() for motivo, conteo in s["rejected"].items())
+    return lineas
+
+
+def _worker_metrics():
+    return [
+        "# HELP zeh_worker_processes Procesos de trabajo configurados para los modelos.",
+        "# TYPE zeh_worker_processes gauge",
+        f"zeh_worker_processes {process_backend.processes}",
+        "# HELP zeh_worker_pool_restarts_total Reinicios del pool tras la muerte de un proceso.",
+        "# TYPE zeh_worker_pool_restarts_total counter",
+        f"zeh_worker_pool_restarts_total {process_backend.restarts}",
+    ]
+
+
+register_collector(_cache_metrics)
+register_collector(_jobs_metrics)
+register_collector(_admission_metrics)
+register_collector(_worker_metrics)
+
+
+@metrics.route('/metrics', methods=['GET'])
+def export():
+    """
+    Ruta GET con las métricas de la API en formato de texto de Prometheus.
+    """
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
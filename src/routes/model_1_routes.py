@@ -7,7 +7,14 @@ utilizando Flask. Implementa validaciones, manejo de errores y documenta cada pa
 
 from flask import Blueprint, request, jsonify
 from flask_cors import cross_origin
-from src.services.model_1_services import run_optimization
+from src.services.model_1_services import run_optimization, screen_sizing
+from src.utils.admission import admission_control
+from src.utils.cache import cached_response
+from src.utils.executor import run_in_worker
+from src.utils.metrics import mark_stage, stage_timer
+from src.utils.encoding import encode_payload, negotiate_format
+from src.utils.validation import (Schema, boolean, integer, number, number_array, one_of,
+                                  summarize_payload)
 import logging
 
 # Configurar logger para registrar errores y eventos importantes
@@ -17,9 +24,33 @@ logger = logging.getLogger(__name__)
 # Crear un blueprint para las rutas del modelo de optimización
 main = Blueprint('optimization_blueprint', __name__)
 
+# Esquema de la solicitud, compilado una sola vez al importar el módulo
+_MENSAJE_COSTOS = "Todos los costos y parámetros deben ser números positivos."
+_MENSAJE_LISTAS = "'generacion_solar' y 'consumo_energia' deben ser listas de números."
+SCHEMA = Schema(required={
+    "K": (integer(minimum=1), "El valor de 'K' debe ser un entero positivo."),
+    "c1": (number(exclusive_minimum=0), _MENSAJE_COSTOS),
+    "c2": (number(exclusive_minimum=0), _MENSAJE_COSTOS),
+    "c3": (number(exclusive_minimum=0), _MENSAJE_COSTOS),
+    "c4": (number(exclusive_minimum=0), _MENSAJE_COSTOS),
+    "gamma": (number(exclusive_minimum=0), _MENSAJE_COSTOS),
+    "r": (number(exclusive_minimum=0), _MENSAJE_COSTOS),
+    "X_max": (number(exclusive_minimum=0), _MENSAJE_COSTOS),
+    "generacion_solar": (number_array(), _MENSAJE_LISTAS),
+    "consumo_energia": (number_array(), _MENSAJE_LISTAS),
+}, optional={
+    "modo": (one_of("exacto", "cribado"), "'modo' debe ser 'exacto' o 'cribado'."),
+    "arranque_caliente": (boolean(), "'arranque_caliente' debe ser un booleano."),
+})
+
+# Servicio que atiende cada modo
+SERVICES = {"exacto": run_optimization, "cribado": screen_sizing}
+
 
 @cross_origin  # Permitir solicitudes de orígenes cruzados
 @main.route('/', methods=['POST'])
+@cached_response('modulo1')
+@admission_control('modulo1')
 def optimize():
     """
     Ruta POST para ejecutar el modelo de optimización energética.
@@ -31,6 +62,17 @@ def optimize():
         - X_max (float): Área máxima disponible para paneles solares (m²).
         - generacion_solar (list[float]): Energía generada por m² (kWh/m²) diaria.
         - consumo_energia (list[float]): Energía consumida diariamente (kWh).
+        - seed (int, opcional): Semilla para resultados reproducibles. Las respuestas con semilla
+          se almacenan en caché.
+        - modo (str, opcional): 'exacto' (por defecto) resuelve el MILP con CBC; 'cribado' evalúa
+          toda la malla entera de área y capacidad con NumPy y devuelve además `Costo_Total` y
+          `Superficie_Costo`.
+        - arranque_caliente (bool, opcional): En modo exacto, entrega al solver el mejor par del
+          cribado como solución inicial.
+
+    Query params:
+        - format (str, opcional): 'columnar' para empaquetar las series (ver `src.utils.encoding`).
+        - binary (str, opcional): 'float32' o 'float64' para enviar las series como base64.
 
     Returns:
         JSON:
@@ -61,46 +103,30 @@ def optimize():
             logger.error("No se proporcionó un JSON válido en la solicitud.")
             return jsonify({"status": "error", "message": "Solicitud inválida. Asegúrate de enviar un JSON válido."}), 400
 
-        # Registrar datos de entrada para auditoría (si es seguro hacerlo)
-        logger.info(f"Datos recibidos: {data}")
-
-        # Validación inicial de las claves necesarias
-        required_keys = {"K", "c1", "c2", "c3", "c4", "gamma",
-                         "r", "X_max", "generacion_solar", "consumo_energia"}
-        missing_keys = required_keys - data.keys()
-        if missing_keys:
-            logger.error(f"Faltan claves requeridas: {missing_keys}")
-            return jsonify({"status": "error", "message": f"Faltan claves requeridas: {missing_keys}"}), 400
-
-        # Validar tipos de datos básicos
-        if not isinstance(data['K'], int) or data['K'] <= 0:
-            logger.error("El valor de 'K' debe ser un entero positivo.")
-            return jsonify({"status": "error", "message": "El valor de 'K' debe ser un entero positivo."}), 400
+        # Registrar un resumen acotado de los datos de entrada (los arreglos no se registran completos)
+        logger.info(f"Datos recibidos: {summarize_payload(data)}")
 
-        if not all(isinstance(data[key], (float, int)) and data[key] > 0 for key in ['c1', 'c2', 'c3', 'c4', 'gamma', 'r', 'X_max']):
-            logger.error(
-                "Todos los costos y parámetros deben ser números positivos.")
-            return jsonify({"status": "error", "message": "Todos los costos y parámetros deben ser números positivos."}), 400
+        # Validar los datos con el esquema del endpoint (lanza ValidationError si no son válidos)
+        data = SCHEMA.validate(data)
 
-        if not isinstance(data['generacion_solar'], list) or not isinstance(data['consumo_energia'], list):
-            logger.error(
-                "'generacion_solar' y 'consumo_energia' deben ser listas de números.")
-            return jsonify({"status": "error", "message": "'generacion_solar' y 'consumo_energia' deben ser listas de números."}), 400
+        # Validar el formato de respuesta solicitado (lanza ValueError si no es válido)
+        negotiate_format()
 
-        """if len(data['generacion_solar']) != data['K'] or len(data['consumo_energia']) != data['K']:
-            logger.error(
-                "Las listas 'generacion_solar' y 'consumo_energia' deben tener longitud igual a 'K'.")
-            return jsonify({"status": "error", "message": "Las listas 'generacion_solar' y 'consumo_energia' deben tener longitud igual a 'K'."}), 400"""
+        mark_stage("validacion")
 
-        # Ejecutar el modelo de optimización
-        results = run_optimization(data)
+        # Ejecutar el modelo de optimización con el servicio del modo solicitado
+        results = run_in_worker(SERVICES[data.get('modo', 'exacto')], data)
 
         # Responder con los resultados
         logger.info("Modelo ejecutado exitosamente.")
-        return jsonify({
-            "status": "success",
-            "results": results
-        }), 200
+        with stage_timer("jsonify"):
+            response = jsonify(encode_payload({
+                "status": "success",
+                "results": results
+            }, arrays=[("results", "Generacion_Solar_kWh_m2"),
+                       ("results", "Consumo_Energetico_kWh"),
+                       ("results", "Estado_Carga_kWh")]))
+        return response, 200
 
     except KeyError as e:
         # Capturar errores relacionados con claves faltantes
@@ -7,7 +7,13 @@ utilizando Flask. Implementa validaciones, manejo de errores y documenta cada pa
 
 from flask import Blueprint, request, jsonify
 from flask_cors import cross_origin
-from src.services.model_2_services import optimize_solar_energy
+from src.services.model_2_services import optimize_solar_energy, simulate_solar_ensemble
+from src.utils.admission import admission_control
+from src.utils.cache import cached_response
+from src.utils.executor import run_in_worker
+from src.utils.metrics import mark_stage, stage_timer
+from src.utils.encoding import encode_payload, negotiate_format
+from src.utils.validation import Schema, integer, number, one_of, summarize_payload
 import logging
 
 # Configurar logger para registrar errores y eventos importantes
@@ -17,9 +23,24 @@ logger = logging.getLogger(__name__)
 # Crear un blueprint para las rutas del modelo de optimización solar
 solar = Blueprint('solar_blueprint', __name__)
 
+# Esquema de la solicitud, compilado una sola vez al importar el módulo
+_MENSAJE_NUMERICOS = "Todos los parámetros deben ser numéricos."
+SCHEMA = Schema(required={
+    "A": (number(), _MENSAJE_NUMERICOS),
+    "eta": (number(), _MENSAJE_NUMERICOS),
+    "I_promedio": (number(), _MENSAJE_NUMERICOS),
+    "horas_sol": (number(), _MENSAJE_NUMERICOS),
+}, optional={
+    "modo": (one_of("determinista", "ensamble"), "'modo' debe ser 'determinista' o 'ensamble'."),
+    "num_realizaciones": (integer(minimum=1),
+                          "'num_realizaciones' debe ser un entero positivo."),
+})
+
 
 @cross_origin  # Permitir solicitudes de orígenes cruzados
 @solar.route('/', methods=['POST'])
+@cached_response('modulo2')
+@admission_control('modulo2')
 def optimize():
     """
     Ruta POST para calcular y optimizar la energía generada por un panel solar.
@@ -28,12 +49,25 @@ def optimize():
         - eta (float): Eficiencia del panel (%).
         - I_promedio (float): Radiación solar promedio diaria (kWh/m²).
         - horas_sol (int): Duración del día (horas).
+        - seed (int, opcional): Semilla para resultados reproducibles. Las respuestas con semilla
+          se almacenan en caché.
+        - modo (str, opcional): 'determinista' (por defecto) optimiza una realización de la
+          radiación; 'ensamble' estima la energía esperada y sus percentiles con
+          `num_realizaciones` realizaciones, con seguimiento y con orientación fija.
+        - num_realizaciones (int, opcional): Tamaño del ensamble (por defecto 1000).
+
+    Query params:
+        - format (str, opcional): 'columnar' para devolver `results` como columnas
+          (ver `src.utils.encoding`).
+        - binary (str, opcional): 'float32' o 'float64' para enviar las columnas como base64.
 
     Returns:
         JSON:
             - status: "success" si el cálculo se ejecuta correctamente.
             - results: Resultados hora a hora del modelo.
-            - total_energy: Energía total generada.
+            - total_energy: Energía total generada (esperada con seguimiento en modo 'ensamble').
+            - ensemble: En modo 'ensamble', orientación fija y energía diaria esperada con sus
+              percentiles P10/P50/P90, con seguimiento y con orientación fija.
             - status: "error" si ocurre un problema, con un mensaje descriptivo.
 
     Ejemplo de entrada JSON:
@@ -53,31 +87,38 @@ def optimize():
             logger.error("No se proporcionó un JSON válido en la solicitud.")
             return jsonify({"status": "error", "message": "Solicitud inválida. Asegúrate de enviar un JSON válido."}), 400
 
-        # Registrar datos de entrada para auditoría (si es seguro hacerlo)
-        logger.info(f"Datos recibidos: {data}")
+        # Registrar un resumen acotado de los datos de entrada (los arreglos no se registran completos)
+        logger.info(f"Datos recibidos: {summarize_payload(data)}")
 
-        # Validación inicial de las claves necesarias
-        required_keys = {"A", "eta", "I_promedio", "horas_sol"}
-        missing_keys = required_keys - data.keys()
-        if missing_keys:
-            logger.error(f"Faltan claves requeridas: {missing_keys}")
-            return jsonify({"status": "error", "message": f"Faltan claves requeridas: {missing_keys}"}), 400
+        # Validar los datos con el esquema del endpoint (lanza ValidationError si no son válidos)
+        data = SCHEMA.validate(data)
 
-        # Validar tipos de datos básicos
-        if not all(isinstance(data[key], (float, int)) for key in required_keys):
-            logger.error("Todos los parámetros deben ser numéricos.")
-            return jsonify({"status": "error", "message": "Todos los parámetros deben ser numéricos."}), 400
+        # Validar el formato de respuesta solicitado (lanza ValueError si no es válido)
+        negotiate_format()
 
-        # Ejecutar el modelo de optimización solar
-        results, total_energy = optimize_solar_energy(data)
+        mark_stage("validacion")
+
+        # Ejecutar el modelo de optimización solar (o el ensamble de realizaciones)
+        payload = {"status": "success"}
+        if data.get('modo') == 'ensamble':
+            results, resumen = run_in_worker(simulate_solar_ensemble, data)
+            payload.update(results=results,
+                           total_energy=resumen["seguimiento"]["energia_esperada"],
+                           ensemble=resumen)
+        else:
+            results, total_energy = run_in_worker(optimize_solar_energy, data)
+            payload.update(results=results, total_energy=total_energy)
 
         # Responder con los resultados
         logger.info("Modelo ejecutado exitosamente.")
-        return jsonify({
-            "status": "success",
-            "results": results,
-            "total_energy": total_energy
-        }), 200
+        with stage_timer("jsonify"):
+            response = jsonify(encode_payload(payload, tables=[("results",)]))
+        return response, 200
+
+    except ValueError as e:
+        # Capturar errores relacionados con validaciones del modelo
+        logger.error(f"Error de validación: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 400
 
     except Exception as e:
         # Capturar errores generales
@@ -8,6 +8,11 @@ utilizando Flask. Implementa validaciones, manejo de errores y documenta cada pa
 from flask import Blueprint, request, jsonify
 from flask_cors import cross_origin
 from src.services.model_3_services import run_monte_carlo_simulation
+from src.utils.admission import admission_control
+from src.utils.cache import cached_response
+from src.utils.executor import run_in_worker
+from src.utils.metrics import mark_stage, stage_timer
+from src.utils.validation import Schema, integer, number, number_pair, string, summarize_payload
 import logging
 
 # Configurar logger para registrar errores y eventos importantes
@@ -17,8 +22,23 @@ logger = logging.getLogger(__name__)
 # Crear un blueprint para las rutas del modelo de simulación
 monte_carlo = Blueprint('monte_carlo_blueprint', __name__)
 
+# Esquema de la solicitud, compilado una sola vez al importar el módulo
+_MENSAJE_RANGOS = "Los rangos deben ser listas de dos números [mínimo, máximo]."
+SCHEMA = Schema(required={
+    "num_simulaciones": (integer(minimum=1), "El valor de 'num_simulaciones' debe ser un entero positivo."),
+    "precio_energia_range": (number_pair(), _MENSAJE_RANGOS),
+    "produccion_solar_range": (number_pair(), _MENSAJE_RANGOS),
+    "consumo_energia_range": (number_pair(), _MENSAJE_RANGOS),
+    "impuesto_mensual": (number(minimum=0), "El valor de 'impuesto_mensual' debe ser un número no negativo."),
+    "region": (string(), "El valor de 'region' debe ser un texto no vacío."),
+    "area_vivienda": (number(exclusive_minimum=0), "El valor de 'area_vivienda' debe ser un número positivo."),
+    "consumo_mensual": (number(minimum=0), "El valor de 'consumo_mensual' debe ser un número no negativo."),
+})
+
 @cross_origin  # Permitir solicitudes de orígenes cruzados
 @monte_carlo.route('/', methods=['POST'])
+@cached_response('modulo3')
+@admission_control('modulo3')
 def simulate():
     """
     Ruta POST para ejecutar la simulación de Monte Carlo para el ahorro energético.
@@ -28,6 +48,11 @@ def simulate():
         - produccion_solar_range (tuple): Rango de producción promedio diaria de energía solar (kWh).
         - consumo_energia_range (tuple): Rango de consumo energético de la casa (kWh).
         - impuesto_mensual (float): Impuesto total mensual de terceros (USD).
+        - region (str): Nombre de la región de la vivienda.
+        - area_vivienda (float): Área de la vivienda en m².
+        - consumo_mensual (float): Consumo mensual de la vivienda en kWh.
+        - seed (int, opcional): Semilla para resultados reproducibles. Las respuestas con semilla
+          se almacenan en caché.
 
     Returns:
         JSON:
@@ -41,7 +66,10 @@ def simulate():
         "precio_energia_range": [0.05, 0.15],
         "produccion_solar_range": [3, 7],
         "consumo_energia_range": [10, 30],
-        "impuesto_mensual": 5
+        "impuesto_mensual": 5,
+        "region": "SIERRA",
+        "area_vivienda": 80,
+        "consumo_mensual": 150
     }
     """
     try:
@@ -53,31 +81,17 @@ def simulate():
             logger.error("No se proporcionó un JSON válido en la solicitud.")
             return jsonify({"status": "error", "message": "Solicitud inválida. Asegúrate de enviar un JSON válido."}), 400
 
-        # Registrar datos de entrada para auditoría (si es seguro hacerlo)
-        logger.info(f"Datos recibidos: {data}")
-
-        # Validación inicial de las claves necesarias
-        required_keys = {"num_simulaciones", "precio_energia_range", "produccion_solar_range", "consumo_energia_range", "impuesto_mensual"}
-        missing_keys = required_keys - data.keys()
-        if missing_keys:
-            logger.error(f"Faltan claves requeridas: {missing_keys}")
-            return jsonify({"status": "error", "message": f"Faltan claves requeridas: {missing_keys}"}), 400
-
-        # Validar tipos de datos básicos
-        if not isinstance(data['num_simulaciones'], int) or data['num_simulaciones'] <= 0:
-            logger.error("El valor de 'num_simulaciones' debe ser un entero positivo.")
-            return jsonify({"status": "error", "message": "El valor de 'num_simulaciones' debe ser un entero positivo."}), 400
+        # Registrar un resumen acotado de los datos de entrada (los arreglos no se registran completos)
+        logger.info(f"Datos recibidos: {summarize_payload(data)}")
 
-        if not all(isinstance(data[key], list) and len(data[key]) == 2 for key in ['precio_energia_range', 'produccion_solar_range', 'consumo_energia_range']):
-            logger.error("Los rangos deben ser listas de dos elementos.")
-            return jsonify({"status": "error", "message": "Los rangos deben ser listas de dos elementos."}), 400
+        # Validar los datos con el esquema del endpoint (lanza ValidationError si no son válidos)
+        data = SCHEMA.validate(data)
 
-        if not isinstance(data['impuesto_mensual'], (float, int)) or data['impuesto_mensual'] < 0:
-            logger.error("El valor de 'impuesto_mensual' debe ser un número no negativo.")
-            return jsonify({"status": "error", "message": "El valor de 'impuesto_mensual' debe ser un número no negativo."}), 400
+        mark_stage("validacion")
 
         # Ejecutar la simulación de Monte Carlo
-        results = run_monte_carlo_simulation(
+        results = run_in_worker(
+            run_monte_carlo_simulation,
             data['num_simulaciones'],
             tuple(data['precio_energia_range']),
             tuple(data['produccion_solar_range']),
@@ -85,15 +99,18 @@ def simulate():
             data['impuesto_mensual'],
             data['region'],
             data['area_vivienda'],
-            data['consumo_mensual']
+            data['consumo_mensual'],
+            seed=data.get('seed')
         )
 
         # Responder con los resultados
         logger.info("Simulación ejecutada exitosamente.")
-        return jsonify({
-            "status": "success",
-            "results": results
-        }), 200
+        with stage_timer("jsonify"):
+            response = jsonify({
+                "status": "success",
+                "results": results
+            })
+        return response, 200
 
     except KeyError as e:
         # Capturar errores relacionados con claves faltantes
@@ -20,6 +20,13 @@ Ejemplo de uso:
 from flask import Blueprint, request, jsonify
 from flask_cors import cross_origin
 from src.services.model_4_services import run_prediction
+from src.utils.admission import admission_control
+from src.utils.cache import cached_response
+from src.utils.executor import run_in_worker
+from src.utils.metrics import mark_stage, stage_timer
+from src.utils.encoding import encode_payload, negotiate_format
+from src.utils.validation import Schema, integer, integer_list, mapping, number, summarize_payload
+import datetime
 import logging
 
 # Configurar logger para registrar errores y eventos importantes
@@ -29,9 +36,21 @@ logger = logging.getLogger(__name__)
 # Crear un blueprint para las rutas del modelo de predicción
 main = Blueprint('prediction_blueprint', __name__)
 
+# Esquema de la solicitud, compilado una sola vez al importar el módulo
+SCHEMA = Schema(required={
+    "electrodomesticos": (mapping(), "'electrodomesticos' debe ser un diccionario."),
+    "dias_historicos": (integer(minimum=1), "'dias_historicos' debe ser un entero positivo."),
+    "orden_arima": (integer_list(length=3), "'orden_arima' debe ser una lista de tres enteros."),
+    "intervalo_confianza": (number(exclusive_minimum=0, exclusive_maximum=1, strict_float=True),
+                            "'intervalo_confianza' debe ser un flotante entre 0 y 1."),
+})
+
 
 @cross_origin  # Permitir solicitudes de orígenes cruzados
 @main.route('/', methods=['POST'])
+# El histórico se fecha a partir del día actual, por lo que la fecha forma parte de la clave
+@cached_response('modulo4', key_extra=lambda: datetime.date.today().isoformat())
+@admission_control('modulo4')
 def predict():
     """
     Ruta POST para ejecutar el modelo de predicción de consumo energético.
@@ -40,6 +59,13 @@ def predict():
         - dias_historicos (int): Número de días históricos a considerar.
         - orden_arima (list[int]): Orden del modelo ARIMA.
         - intervalo_confianza (float): Nivel de confianza para el intervalo de predicción.
+        - seed (int, opcional): Semilla para resultados reproducibles. Las respuestas con semilla
+          se almacenan en caché.
+
+    Query params:
+        - format (str, opcional): 'columnar' para devolver `historico` como columnas
+          (ver `src.utils.encoding`).
+        - binary (str, opcional): 'float32' o 'float64' para enviar las columnas como base64.
 
     Returns:
         JSON:
@@ -74,41 +100,28 @@ def predict():
             logger.error("No se proporcionó un JSON válido en la solicitud.")
             return jsonify({"status": "error", "message": "Solicitud inválida. Asegúrate de enviar un JSON válido."}), 400
 
-        # Registrar datos de entrada para auditoría (si es seguro hacerlo)
-        logger.info(f"Datos recibidos: {data}")
-
-        # Validación inicial de las claves necesarias
-        required_keys = {"electrodomesticos", "dias_historicos",
-                         "orden_arima", "intervalo_confianza"}
-        missing_keys = required_keys - data.keys()
-        if missing_keys:
-            logger.error(f"Faltan claves requeridas: {missing_keys}")
-            return jsonify({"status": "error", "message": f"Faltan claves requeridas: {missing_keys}"}), 400
-
-        # Validar tipos de datos básicos
-        if not isinstance(data['electrodomesticos'], dict):
-            logger.error("'electrodomesticos' debe ser un diccionario.")
-            return jsonify({"status": "error", "message": "'electrodomesticos' debe ser un diccionario."}), 400
-        if not isinstance(data['dias_historicos'], int) or data['dias_historicos'] <= 0:
-            logger.error("'dias_historicos' debe ser un entero positivo.")
-            return jsonify({"status": "error", "message": "'dias_historicos' debe ser un entero positivo."}), 400
-        if not isinstance(data['orden_arima'], list) or len(data['orden_arima']) != 3 or not all(isinstance(i, int) for i in data['orden_arima']):
-            logger.error("'orden_arima' debe ser una lista de tres enteros.")
-            return jsonify({"status": "error", "message": "'orden_arima' debe ser una lista de tres enteros."}), 400
-        if not isinstance(data['intervalo_confianza'], float) or not (0 < data['intervalo_confianza'] < 1):
-            logger.error(
-                "'intervalo_confianza' debe ser un flotante entre 0 y 1.")
-            return jsonify({"status": "error", "message": "'intervalo_confianza' debe ser un flotante entre 0 y 1."}), 400
+        # Registrar un resumen acotado de los datos de entrada (los arreglos no se registran completos)
+        logger.info(f"Datos recibidos: {summarize_payload(data)}")
+
+        # Validar los datos con el esquema del endpoint (lanza ValidationError si no son válidos)
+        data = SCHEMA.validate(data)
+
+        # Validar el formato de respuesta solicitado (lanza ValueError si no es válido)
+        negotiate_format()
+
+        mark_stage("validacion")
 
         # Ejecutar el modelo de predicción
-        results = run_prediction(data)
+        results = run_in_worker(run_prediction, data)
 
         # Responder con los resultados
         logger.info("Modelo ejecutado exitosamente.")
-        return jsonify({
-            "status": "success",
-            "results": results
-        }), 200
+        with stage_timer("jsonify"):
+            response = jsonify(encode_payload({
+                "status": "success",
+                "results": results
+            }, tables=[("results", "historico")]))
+        return response, 200
 
     except KeyError as e:
         # Capturar errores relacionados con claves faltantes
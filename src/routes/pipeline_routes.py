@@ -0,0 +1,140 @@
+"""
+pipeline_routes.py
+
+Este módulo define la ruta del pipeline de planificación ZEH utilizando Flask. Encadena en el
+mismo proceso la predicción de consumo (módulo 4), el dimensionamiento (módulo 1), la orientación
+(módulo 2, en paralelo) y la evaluación económica (módulo 3) en una sola solicitud.
+"""
+
+from flask import Blueprint, request, jsonify
+from flask_cors import cross_origin
+from src.routes import model_1_routes, model_2_routes, model_3_routes, model_4_routes
+from src.services.pipeline_services import run_pipeline
+from src.utils.admission import admission_control
+from src.utils.cache import cached_response
+from src.utils.metrics import mark_stage, stage_timer
+from src.utils.validation import SEED_RULE, ValidationError, summarize_payload
+import datetime
+import logging
+
+# Configurar logger para registrar errores y eventos importantes
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Crear un blueprint para la ruta del pipeline
+pipeline = Blueprint('pipeline_blueprint', __name__)
+
+# Esquemas de cada sección, derivados de los de cada módulo sin los campos que calcula el pipeline
+SECTION_SCHEMAS = {
+    "modulo4": model_4_routes.SCHEMA,
+    "modulo1": model_1_routes.SCHEMA.without("K", "generacion_solar", "consumo_energia"),
+    "modulo2": model_2_routes.SCHEMA,
+    "modulo3": model_3_routes.SCHEMA.without("produccion_solar_range", "consumo_energia_range"),
+}
+
+
+class _PipelineSchema:
+    """Valida el cuerpo del pipeline aplicando el esquema de cada sección."""
+
+    def validate(self, data):
+        if not isinstance(data, dict):
+            raise ValidationError("Solicitud inválida. Asegúrate de enviar un JSON válido.")
+        faltantes = SECTION_SCHEMAS.keys() - data.keys()
+        if faltantes:
+            raise ValidationError(f"Faltan secciones requeridas: {set(faltantes)}")
+        resultado = dict(data)
+        if 'seed' in data:
+            regla, mensaje = SEED_RULE
+            try:
+                regla(data['seed'])
+            except Exception:
+                raise ValidationError(mensaje)
+        for seccion, schema in SECTION_SCHEMAS.items():
+            try:
+                resultado[seccion] = schema.validate(data[seccion])
+            except ValidationError as e:
+                raise ValidationError(f"{seccion}: {str(e)}")
+        return resultado
+
+
+SCHEMA = _PipelineSchema()
+
+
+@cross_origin  # Permitir solicitudes de orígenes cruzados
+@pipeline.route('/', methods=['POST'])
+# El histórico se fecha a partir del día actual, por lo que la fecha forma parte de la clave
+@cached_response('pipeline', key_extra=lambda: datetime.date.today().isoformat())
+@admission_control('pipeline')
+def plan():
+    """
+    Ruta POST para ejecutar el pipeline completo de planificación ZEH.
+    Espera un JSON con una sección por módulo:
+        - modulo4 (dict): Igual que la ruta del módulo 4.
+        - modulo1 (dict): Igual que la ruta del módulo 1, sin `K`, `generacion_solar` ni
+          `consumo_energia` (se derivan de la predicción del módulo 4).
+        - modulo2 (dict): Igual que la ruta del módulo 2.
+        - modulo3 (dict): Igual que la ruta del módulo 3, sin `produccion_solar_range` ni
+          `consumo_energia_range` (se derivan de los módulos 1 y 4).
+        - seed (int, opcional): Semilla aplicada a las secciones que no definen la suya.
+
+    Returns:
+        JSON:
+            - status: "success" si el pipeline se ejecuta correctamente.
+            - results: `consumo`, `dimensionamiento`, `orientacion`, `economia` y `tiempos_ms`
+              (duración de cada etapa y total, en milisegundos).
+            - status: "error" si ocurre un problema, con un mensaje descriptivo.
+
+    Ejemplo de entrada JSON:
+    {
+        "seed": 42,
+        "modulo4": {"electrodomesticos": {"Refrigeradora": 1.2, "Televisor": 0.1},
+                    "dias_historicos": 30, "orden_arima": [5, 1, 0], "intervalo_confianza": 0.95},
+        "modulo1": {"c1": 100, "c2": 500, "c3": 0.05, "c4": 0.25, "gamma": 0.90, "r": 0.2, "X_max": 20},
+        "modulo2": {"A": 10, "eta": 0.20, "I_promedio": 5.5, "horas_sol": 12},
+        "modulo3": {"num_simulaciones": 10000, "precio_energia_range": [0.05, 0.15],
+                    "impuesto_mensual": 5, "region": "SIERRA", "area_vivienda": 80, "consumo_mensual": 150}
+    }
+    """
+    try:
+        # Obtener datos JSON enviados en la solicitud
+        data = request.get_json()
+
+        # Validar que los datos JSON sean proporcionados
+        if not data:
+            logger.error("No se proporcionó un JSON válido en la solicitud.")
+            return jsonify({"status": "error", "message": "Solicitud inválida. Asegúrate de enviar un JSON válido."}), 400
+
+        # Registrar un resumen acotado de los datos de entrada (los arreglos no se registran completos)
+        logger.info(f"Datos recibidos: {summarize_payload(data)}")
+
+        # Validar cada sección con el esquema de su módulo
+        data = SCHEMA.validate(data)
+
+        mark_stage("validacion")
+
+        # Ejecutar el pipeline
+        results = run_pipeline(data)
+
+        # Responder con los resultados
+        logger.info("Pipeline ejecutado exitosamente.")
+        with stage_timer("jsonify"):
+            response = jsonify({
+                "status": "success",
+                "results": results
+            })
+        return response, 200
+
+    except KeyError as e:
+        # Capturar errores relacionados con claves faltantes
+        logger.error(f"Clave faltante: {str(e)}")
+        return jsonify({"status": "error", "message": f"Clave faltante: {str(e)}"}), 400
+
+    except ValueError as e:
+        # Capturar errores relacionados con validaciones del modelo
+        logger.error(f"Error de validación: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    except Exception as e:
+        # Capturar errores generales
+        logger.error(f"Error inesperado: {str(e)}")
+        return jsonify({"status": "error", "message": "Ocurrió un error inesperado. Por favor, intenta nuevamente."}), 500
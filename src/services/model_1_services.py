@@ -6,11 +6,182 @@ El modelo ahora es un modelo de programación lineal entera (PLE), donde el áre
 y la capacidad de la batería son variables enteras.
 """
 
+import os
+
 import pulp
 import numpy as np
+from scipy.signal import lfilter
+from src.utils.jobs import report_progress
+from src.utils.metrics import stage_timer
+
+# Celdas máximas de cada matriz del cribado: estado de carga (área × día) y superficie de costos
+# (área × capacidad)
+MAX_SCREENING_CELLS = int(os.environ.get("ZEH_SCREENING_MAX_CELLS", 2_000_000))
+
+# Tolerancia numérica de las restricciones en el cribado
+_TOL = 1e-7
+
 
+def _series(data, generacion_solar=None, consumo_energia=None):
+    """
+    Obtiene las series de generación y consumo, sintetizando las que no se indiquen.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Generación (kWh/m²) y consumo (kWh) por día.
 
-def run_optimization(data):
+    Raises:
+        ValueError: Si las longitudes no coinciden con `K`.
+    """
+    K = data['K']  # Número de días
+
+    # Generación de datos sintéticos de generación solar y consumo energético
+    # Generador propio (reproducible si se envía 'seed')
+    rng = np.random.default_rng(data.get('seed'))
+    if generacion_solar is None:
+        generacion_solar = rng.uniform(
+            2, 6, K)  # kWh/m² generados por día
+    if consumo_energia is None:
+        consumo_energia = rng.uniform(5, 14, K)  # Consumo diario en kWh
+    generacion_solar = np.asarray(generacion_solar, dtype=float)
+    consumo_energia = np.asarray(consumo_energia, dtype=float)
+
+    # Verificar dimensiones de listas
+    if len(generacion_solar) != K or len(consumo_energia) != K:
+        raise ValueError(
+            "Las longitudes de 'generacion_solar' y 'consumo_energia' deben coincidir con 'K'.")
+    return generacion_solar, consumo_energia
+
+
+def _screen(data, generacion_solar, consumo_energia):
+    """
+    Evalúa el modelo sobre toda la malla entera de áreas de panel (X1) y capacidades de batería
+    (X2).
+
+    Para un X1 fijo, la restricción de balance determina por completo el estado de carga:
+    X3[k] = gamma * X3[k-1] + X1 * G[k] - C[k], con X3[-1] = 0. La recursión es lineal en X1, así
+    que se resuelve una sola vez para G y para C (`lfilter`) y X3 = X1 * A - B para todas las áreas
+    a la vez. X2 solo interviene en las restricciones de capacidad y tasa (que fijan un X2 mínimo
+    por fila) y en los términos de exceso y déficit, que para cada fila se evalúan en todos los X2
+    con sumas acumuladas sobre el estado de carga ordenado. Por encima de max(X3) / min(gamma, 1)
+    el exceso es nulo y el costo solo crece con X2, por lo que la malla recorrida contiene el
+    óptimo exacto.
+
+    Returns:
+        dict: Mejor par, su costo y estado de carga, y la superficie de costos (np.inf en las
+        celdas no factibles).
+    """
+    c1, c2, c3, c4 = data['c1'], data['c2'], data['c3'], data['c4']
+    gamma, r = data['gamma'], data['r']
+
+    # Comprobar el tamaño del estado de carga antes de reservarlo: X_max no tiene cota superior
+    filas = float(np.floor(data['X_max'] + _TOL)) + 1
+    if not filas * max(len(generacion_solar), 1) <= MAX_SCREENING_CELLS:
+        raise ValueError(
+            f"La malla de cribado ({filas:.3g} áreas x {len(generacion_solar)} días) supera el "
+            f"máximo de {MAX_SCREENING_CELLS} celdas. Usa el modo exacto.")
+
+    X1 = np.arange(int(filas), dtype=float)
+    A = lfilter([1.0], [1.0, -gamma], generacion_solar)
+    B = lfilter([1.0], [1.0, -gamma], consumo_energia)
+    X3 = X1[:, None] * A - B  # (áreas, días)
+
+    # Factibilidad que solo depende de X1: SoC no negativo y cobertura energética
+    factible = (X3.min(axis=1) >= -_TOL) & \
+        (X1 * generacion_solar.sum() >= consumo_energia.sum() - _TOL)
+    if not factible.any():
+        raise ValueError("No se encontró una solución factible en la malla de cribado.")
+
+    # X2 mínimo por fila: capacidad (X3 <= X2) y tasa de carga/descarga (|ΔX3| <= r * X2)
+    salto = np.abs(np.diff(X3, axis=1)).max(axis=1) if X3.shape[1] > 1 else np.zeros(X1.size)
+    with np.errstate(over='ignore'):  # un r diminuto da inf, que la comprobación de abajo rechaza
+        x2_min = np.ceil(np.maximum(X3.max(axis=1), salto / r) - _TOL)
+    x2_sin_exceso = np.ceil(X3.max(axis=1) / min(gamma, 1.0) - _TOL)
+    x2_lo = x2_min[factible].min()
+    x2_hi = np.maximum(x2_min, x2_sin_exceso)[factible].max()
+    # Igual que con las áreas, comprobar la superficie antes de reservarla: con un `r` pequeño el
+    # X2 mínimo por tasa de carga crece sin límite
+    columnas = x2_hi - x2_lo + 1 if np.isfinite(x2_lo) else np.inf
+    if not X1.size * columnas <= MAX_SCREENING_CELLS:
+        raise ValueError(
+            f"La malla de cribado ({X1.size} x {columnas:.3g}) supera el máximo de "
+            f"{MAX_SCREENING_CELLS} celdas. Usa el modo exacto.")
+    X2 = np.arange(int(x2_lo), int(x2_hi) + 1, dtype=float)
+
+    # Exceso y déficit para todos los X2 de cada fila: con el estado de carga ordenado y sus sumas
+    # acumuladas, sum(max(0, t - x)) = t * n_bajo - suma_bajo para cada umbral t = gamma * X2
+    ordenado = np.sort(X3, axis=1)
+    acumulado = np.concatenate([np.zeros((X1.size, 1)), np.cumsum(ordenado, axis=1)], axis=1)
+    total = acumulado[:, -1]
+    umbral = gamma * X2
+    superficie = np.full((X1.size, X2.size), np.inf)
+    K = X3.shape[1]
+    for i in np.flatnonzero(factible):
+        n_bajo = np.searchsorted(ordenado[i], umbral)
+        suma_bajo = acumulado[i, n_bajo]
+        deficit = umbral * n_bajo - suma_bajo
+        exceso = (total[i] - suma_bajo) - umbral * (K - n_bajo)
+        costo = c1 * X1[i] + c2 * X2 + c3 * exceso + c4 * deficit
+        superficie[i] = np.where(X2 >= x2_min[i], costo, np.inf)
+
+    i, j = np.unravel_index(np.argmin(superficie), superficie.shape)
+    return {
+        "x1": int(X1[i]),
+        "x2": int(X2[j]),
+        "costo": float(superficie[i, j]),
+        "soc": X3[i],
+        "areas": X1,
+        "capacidades": X2,
+        "superficie": superficie,
+    }
+
+
+def screen_sizing(data, generacion_solar=None, consumo_energia=None):
+    """
+    Dimensiona el sistema por cribado de la malla entera, sin el solver MILP.
+
+    Mismos argumentos que `run_optimization`.
+
+    Returns:
+        dict: Los mismos campos que `run_optimization` más:
+            - Costo_Total: Costo del mejor par.
+            - Superficie_Costo: Ejes (`Area_Panel_m2`, `Capacidad_Bateria_kWh`) y matriz `Costo`
+              (una fila por área; None en las combinaciones no factibles).
+    """
+    try:
+        generacion_solar, consumo_energia = _series(data, generacion_solar, consumo_energia)
+
+        report_progress(0.1, "cribando")
+        with stage_timer("cribado"):
+            cribado = _screen(data, generacion_solar, consumo_energia)
+            superficie = cribado["superficie"]
+            costos = np.where(np.isfinite(superficie), superficie, np.nan).tolist()
+            costos = [[None if c != c else c for c in fila] for fila in costos]
+
+        return {
+            "Area_Panel_m2": cribado["x1"],
+            "Capacidad_Bateria_kWh": cribado["x2"],
+            "Costo_Total": cribado["costo"],
+            "Generacion_Solar_kWh_m2": generacion_solar.tolist(),
+            "Consumo_Energetico_kWh": consumo_energia.tolist(),
+            "Estado_Carga_kWh": cribado["soc"].tolist(),
+            "Superficie_Costo": {
+                "Area_Panel_m2": cribado["areas"].astype(int).tolist(),
+                "Capacidad_Bateria_kWh": cribado["capacidades"].astype(int).tolist(),
+                "Costo": costos,
+            },
+        }
+
+    except KeyError as e:
+        # Capturar errores relacionados con claves faltantes
+        raise KeyError(f"Clave faltante en los datos de entrada: {e}")
+    except ValueError:
+        raise
+    except Exception as e:
+        # Capturar cualquier otro error y volver a lanzarlo
+        raise RuntimeError(f"Error al ejecutar el cribado: {str(e)}")
+
+
+def run_optimization(data, generacion_solar=None, consumo_energia=None):
     """
     Ejecuta el modelo de optimización energética basado en los datos proporcionados.
 
@@ -23,6 +194,13 @@ def run_optimization(data):
             - X_max (float): Área máxima disponible para paneles solares.
             - generacion_solar (list[float]): Energía generada por m² (kWh/m²) diaria.
             - consumo_energia (list[float]): Energía consumida diariamente (kWh).
+            - seed (int, opcional): Semilla del generador aleatorio para resultados reproducibles.
+            - arranque_caliente (bool, opcional): Si el mejor par del cribado (`screen_sizing`)
+              se entrega al solver como solución inicial.
+        generacion_solar (np.ndarray, optional): Serie de generación (kWh/m²) calculada por otro
+            servicio. Si no se indica, se generan datos sintéticos.
+        consumo_energia (np.ndarray, optional): Serie de consumo (kWh) calculada por otro
+            servicio. Si no se indica, se generan datos sintéticos.
 
     Returns:
         dict: Resultados de la optimización con los valores óptimos de las variables.
@@ -43,75 +221,92 @@ def run_optimization(data):
         r = data['r']  # Tasa máxima de carga/descarga
         X_max = data['X_max']  # Área máxima disponible para paneles solares
 
-        # Generación de datos sintéticos de generación solar y consumo energético
-        # Fijar semilla para reproducibilidad
-        # np.random.seed(42)
-        generacion_solar = np.random.uniform(
-            2, 6, K)  # kWh/m² generados por día
-        consumo_energia = np.random.uniform(5, 14, K)  # Consumo diario en kWh
-
-        # Verificar dimensiones de listas
-        if len(generacion_solar) != K or len(consumo_energia) != K:
-            raise ValueError(
-                "Las longitudes de 'generacion_solar' y 'consumo_energia' deben coincidir con 'K'.")
+        # Series de generación solar y consumo energético
+        generacion_solar, consumo_energia = _series(data, generacion_solar, consumo_energia)
 
         # Crear modelo de optimización
-        modelo = pulp.LpProblem("Optimizacion_Energetica", pulp.LpMinimize)
-
-        # Variables de decisión
-        # Área de paneles solares (entera)
-        X1 = pulp.LpVariable("Area_Panel", lowBound=0,
-                             upBound=X_max, cat='Integer')
-        # Capacidad de la batería (entera)
-        X2 = pulp.LpVariable("Capacidad_Bateria", lowBound=0, cat='Integer')
-        # Estado de carga de la batería (continuo)
-        X3 = [pulp.LpVariable(f"SoC_{k}", lowBound=0) for k in range(K)]
-        # Energía excedente (continuo)
-        exceso = [pulp.LpVariable(f"Exceso_{k}", lowBound=0) for k in range(K)]
-        # Energía deficitaria (continuo)
-        deficit = [pulp.LpVariable(
-            f"Deficit_{k}", lowBound=0) for k in range(K)]
-
-        # Definir función objetivo
-        # Minimizamos el costo total compuesto por paneles solares, batería, excedentes y déficits
-        costo_total = (
-            c1 * X1 + c2 * X2 +
-            pulp.lpSum([c3 * exceso[k] + c4 * deficit[k] for k in range(K)])
-        )
-        modelo += costo_total
-
-        # Restricciones del modelo
-        for k in range(K):
-            if k == 0:
-                # Restricción de balance energético inicial
-                modelo += X3[k] == gamma * 0 + X1 * \
-                    generacion_solar[k] - consumo_energia[k]
-            else:
-                # Restricción de balance energético para días subsiguientes
-                modelo += X3[k] == gamma * X3[k-1] + X1 * \
-                    generacion_solar[k] - consumo_energia[k]
-
-            # Restricciones para exceso y déficit energético
-            modelo += exceso[k] >= X3[k] - gamma * X2
-            modelo += deficit[k] >= gamma * X2 - X3[k]
-
-        for k in range(1, K):
-            # Restricción de tasa máxima de carga
-            modelo += X3[k] - X3[k-1] <= r * X2
-            # Restricción de tasa máxima de descarga
-            modelo += X3[k-1] - X3[k] <= r * X2
-
-        # Restricción de cobertura energética
-        modelo += X1 * sum(generacion_solar) >= sum(consumo_energia)
-
-        for k in range(K):
-            # Restricción de que el SoC no sea negativo
-            modelo += X3[k] >= 0
-            # Restricción de que el SoC no exceda la capacidad de la batería
-            modelo += X3[k] <= X2
+        with stage_timer("construccion"):
+            modelo = pulp.LpProblem("Optimizacion_Energetica", pulp.LpMinimize)
+
+            # Variables de decisión
+            # Área de paneles solares (entera)
+            X1 = pulp.LpVariable("Area_Panel", lowBound=0,
+                                 upBound=X_max, cat='Integer')
+            # Capacidad de la batería (entera)
+            X2 = pulp.LpVariable("Capacidad_Bateria", lowBound=0, cat='Integer')
+            # Estado de carga de la batería (continuo)
+            X3 = [pulp.LpVariable(f"SoC_{k}", lowBound=0) for k in range(K)]
+            # Energía excedente (continuo)
+            exceso = [pulp.LpVariable(f"Exceso_{k}", lowBound=0) for k in range(K)]
+            # Energía deficitaria (continuo)
+            deficit = [pulp.LpVariable(
+                f"Deficit_{k}", lowBound=0) for k in range(K)]
+
+            # Definir función objetivo
+            # Minimizamos el costo total compuesto por paneles solares, batería, excedentes y déficits
+            costo_total = (
+                c1 * X1 + c2 * X2 +
+                pulp.lpSum([c3 * exceso[k] + c4 * deficit[k] for k in range(K)])
+            )
+            modelo += costo_total
+
+            # Restricciones del modelo
+            for k in range(K):
+                if k == 0:
+                    # Restricción de balance energético inicial
+                    modelo += X3[k] == gamma * 0 + X1 * \
+                        generacion_solar[k] - consumo_energia[k]
+                else:
+                    # Restricción de balance energético para días subsiguientes
+                    modelo += X3[k] == gamma * X3[k-1] + X1 * \
+                        generacion_solar[k] - consumo_energia[k]
+
+                # Restricciones para exceso y déficit energético
+                modelo += exceso[k] >= X3[k] - gamma * X2
+                modelo += deficit[k] >= gamma * X2 - X3[k]
+
+            for k in range(1, K):
+                # Restricción de tasa máxima de carga
+                modelo += X3[k] - X3[k-1] <= r * X2
+                # Restricción de tasa máxima de descarga
+                modelo += X3[k-1] - X3[k] <= r * X2
+
+            # Restricción de cobertura energética
+            modelo += X1 * sum(generacion_solar) >= sum(consumo_energia)
+
+            for k in range(K):
+                # Restricción de que el SoC no sea negativo
+                modelo += X3[k] >= 0
+                # Restricción de que el SoC no exceda la capacidad de la batería
+                modelo += X3[k] <= X2
+
+        # Solución inicial a partir del cribado: el estado de carga, el exceso y el déficit quedan
+        # determinados por el mejor par, así que CBC recibe una solución factible completa
+        solver = None
+        cribado = None
+        if data.get('arranque_caliente'):
+            report_progress(0.3, "cribando")
+            try:
+                with stage_timer("cribado"):
+                    cribado = _screen(data, generacion_solar, consumo_energia)
+            except (ValueError, MemoryError):
+                # Malla sin solución factible o demasiado grande: se resuelve sin solución inicial
+                cribado = None
+        if cribado is not None:
+            X1.setInitialValue(cribado["x1"])
+            X2.setInitialValue(cribado["x2"])
+            for k in range(K):
+                soc = float(cribado["soc"][k])
+                X3[k].setInitialValue(soc)
+                exceso[k].setInitialValue(max(0.0, soc - gamma * cribado["x2"]))
+                deficit[k].setInitialValue(max(0.0, gamma * cribado["x2"] - soc))
+            solver = pulp.PULP_CBC_CMD(warmStart=True)
 
         # Resolver el modelo
-        modelo.solve()
+        report_progress(0.5, "resolviendo")
+        with stage_timer("solver"):
+            modelo.solve(solver)
+        report_progress(0.95, "extrayendo resultados")
 
         # Verificar si se encontró una solución óptima
         if modelo.status != pulp.LpStatusOptimal:
@@ -5,8 +5,24 @@ Este módulo define la lógica para calcular y optimizar la energía generada
 por un panel solar utilizando `numpy` y `scipy`.
 """
 
+import os
+
 import numpy as np
 from scipy.optimize import minimize
+from src.utils.jobs import report_progress
+from src.utils.metrics import stage_timer
+
+# Celdas (realizaciones × horas) de cada bloque del ensamble
+ENSEMBLE_CHUNK_CELLS = int(os.environ.get("ZEH_ENSEMBLE_CHUNK_CELLS", 250_000))
+
+# Intervalos de los histogramas con los que se estiman los percentiles
+SKETCH_BINS = 2048
+
+# Rango del factor aleatorio de radiación de cada hora
+FACTOR_RADIACION = (0.7, 1.3)
+
+# Percentiles reportados por el ensamble
+PERCENTILES = (0.1, 0.5, 0.9)
 
 
 def optimize_solar_energy(data):
@@ -18,6 +34,7 @@ def optimize_solar_energy(data):
             - eta (float): Eficiencia del panel (%).
             - I_promedio (float): Radiación solar promedio diaria (kWh/m²).
             - horas_sol (int): Duración del día (horas).
+            - seed (int, opcional): Semilla del generador aleatorio para resultados reproducibles.
 
     Returns:
         tuple: Lista de resultados hora a hora y energía total generada.
@@ -26,6 +43,7 @@ def optimize_solar_energy(data):
     eta = data['eta']
     I_promedio = data['I_promedio']
     horas_sol = int(data['horas_sol'])
+    rng = np.random.default_rng(data.get('seed'))
 
     horas = np.arange(6, 6 + horas_sol)
     altitud_solar = np.radians(45 + 15 * np.sin((horas - 12) * np.pi / 12))
@@ -44,19 +62,186 @@ def optimize_solar_energy(data):
     resultados = []
     energia_total = 0
 
-    for t, (beta, alpha) in enumerate(zip(altitud_solar, azimut_solar)):
-        radiacion_hora = I_promedio * np.random.uniform(0.7, 1.3)
-        res = minimize(energia, [30, 0], args=(
-            beta, alpha, A, eta, radiacion_hora), bounds=bounds, method='L-BFGS-B')
-        theta_opt, phi_opt = res.x
-        energia_hora = -res.fun
-        energia_total += energia_hora
+    with stage_timer("optimizacion"):
+        for t, (beta, alpha) in enumerate(zip(altitud_solar, azimut_solar)):
+            report_progress(t / horas_sol, "optimizando orientación")
+            radiacion_hora = I_promedio * rng.uniform(*FACTOR_RADIACION)
+            res = minimize(energia, [30, 0], args=(
+                beta, alpha, A, eta, radiacion_hora), bounds=bounds, method='L-BFGS-B')
+            theta_opt, phi_opt = res.x
+            energia_hora = -res.fun
+            energia_total += energia_hora
+            resultados.append({
+                "Hora": int(horas[t]),
+                "Radiación Solar (kWh/m²)": float(radiacion_hora),
+                "Inclinación (θ)": float(theta_opt),
+                "Orientación (φ)": float(phi_opt),
+                "Energía Generada (kWh)": float(energia_hora)
+            })
+
+    return resultados, float(energia_total)
+
+
+def _geometria(horas_sol):
+    """Horas del día con la altitud y el azimut solar (radianes) de cada una."""
+    horas = np.arange(6, 6 + horas_sol)
+    altitud_solar = np.radians(45 + 15 * np.sin((horas - 12) * np.pi / 12))
+    azimut_solar = np.radians((horas - 12) * 15)
+    return horas, altitud_solar, azimut_solar
+
+
+def _incidencia(theta, phi, beta, alpha):
+    """Coseno del ángulo de incidencia para una inclinación y orientación (grados)."""
+    theta_rad = np.radians(theta)
+    phi_rad = np.radians(phi)
+    return (np.sin(theta_rad) * np.sin(beta) +
+            np.cos(theta_rad) * np.cos(beta) * np.cos(phi_rad - alpha))
+
+
+class _HistogramSketch:
+    """
+    Boceto de cuantiles por columna con histogramas de ancho fijo.
+
+    Cada columna tiene un rango conocido de antemano, por lo que la memoria es
+    `columnas × SKETCH_BINS` contadores sin importar cuántas muestras se agreguen, y el error de
+    cada cuantil es a lo sumo el ancho de un intervalo.
+
+    Args:
+        lo (np.ndarray): Límite inferior de cada columna.
+        hi (np.ndarray): Límite superior de cada columna.
+        bins (int): Intervalos por columna.
+    """
+
+    def __init__(self, lo, hi, bins=SKETCH_BINS):
+        self.lo = np.asarray(lo, dtype=float)
+        self.ancho = (np.maximum(np.asarray(hi, dtype=float), self.lo + 1e-12) - self.lo) / bins
+        self.bins = bins
+        self.counts = np.zeros((self.lo.size, bins), dtype=np.int64)
+        self._offsets = np.arange(self.lo.size) * bins
+
+    def update(self, valores):
+        """Agrega un bloque de muestras de forma (muestras, columnas)."""
+        idx = np.clip(((valores - self.lo) / self.ancho).astype(np.int64), 0, self.bins - 1)
+        self.counts += np.bincount((idx + self._offsets).ravel(),
+                                   minlength=self.counts.size).reshape(self.counts.shape)
+
+    def quantiles(self, qs):
+        """
+        Estima cuantiles interpolando linealmente dentro de cada intervalo.
+
+        Returns:
+            np.ndarray: Arreglo de forma (len(qs), columnas).
+        """
+        acumulado = np.cumsum(self.counts, axis=1)
+        total = acumulado[:, -1]
+        columnas = np.arange(self.lo.size)
+        resultado = np.empty((len(qs), self.lo.size))
+        for i, q in enumerate(qs):
+            objetivo = q * total
+            b = np.argmax(acumulado >= objetivo[:, None], axis=1)
+            previo = np.where(b > 0, acumulado[columnas, b - 1], 0)
+            conteo = np.maximum(self.counts[columnas, b], 1)
+            fraccion = np.clip((objetivo - previo) / conteo, 0, 1)
+            resultado[i] = self.lo + (b + fraccion) * self.ancho
+        return resultado
+
+
+def simulate_solar_ensemble(data):
+    """
+    Estima la distribución de la energía generada con un ensamble de realizaciones de radiación.
+
+    El factor aleatorio de radiación escala la energía de cada hora sin cambiar la orientación
+    óptima, así que las orientaciones se calculan una sola vez: la de seguimiento (óptima en cada
+    hora) y la fija (la que maximiza la energía esperada del día). Las realizaciones se generan por
+    bloques de (realizaciones × horas) y se acumulan en medias y en bocetos de percentiles, de modo
+    que la memoria no crece con el tamaño del ensamble. La orientación fija no genera energía
+    negativa en las horas en que el sol queda detrás del panel.
+
+    Args:
+        data (dict): Los mismos parámetros que `optimize_solar_energy` más:
+            - num_realizaciones (int, opcional): Tamaño del ensamble (por defecto 1000).
+
+    Returns:
+        tuple: Lista de resultados hora a hora (orientación de seguimiento, energía esperada y
+        percentiles P10/P50/P90 con seguimiento y con orientación fija) y resumen diario
+        (`num_realizaciones`, `orientacion_fija`, `seguimiento` y `fija` con la energía esperada
+        y sus percentiles).
+    """
+    A = data['A']
+    eta = data['eta']
+    I_promedio = data['I_promedio']
+    horas_sol = int(data['horas_sol'])
+    num_realizaciones = int(data.get('num_realizaciones', 1000))
+    rng = np.random.default_rng(data.get('seed'))
+
+    horas, altitud_solar, azimut_solar = _geometria(horas_sol)
+    bounds = [(0, 90), (-180, 180)]
+
+    with stage_timer("orientacion"):
+        # Seguimiento: orientación óptima de cada hora (independiente del factor de radiación)
+        seguimiento = [minimize(lambda x, b=beta, a=alpha: -_incidencia(x[0], x[1], b, a),
+                                [30, 0], bounds=bounds, method='L-BFGS-B').x
+                       for beta, alpha in zip(altitud_solar, azimut_solar)]
+        ganancia_seguimiento = np.array([_incidencia(t, p, b, a) for (t, p), b, a
+                                         in zip(seguimiento, altitud_solar, azimut_solar)])
+
+        # Fija: una sola orientación que maximiza la incidencia total del día
+        fija = minimize(lambda x: -np.sum(_incidencia(x[0], x[1], altitud_solar, azimut_solar)),
+                        [30, 0], bounds=bounds, method='L-BFGS-B').x
+        ganancia_fija = np.maximum(0, _incidencia(fija[0], fija[1], altitud_solar, azimut_solar))
+
+    # Energía por unidad de factor de radiación, por hora: (seguimiento..., fija...)
+    escala = A * eta * I_promedio * np.concatenate([ganancia_seguimiento, ganancia_fija])
+    extremos = escala[None, :] * np.array(FACTOR_RADIACION)[:, None]
+    lo, hi = extremos.min(axis=0), extremos.max(axis=0)
+    # Columnas del boceto: energía por hora (seguimiento y fija) y total diario de cada una
+    boceto = _HistogramSketch(
+        np.concatenate([lo, [lo[:horas_sol].sum(), lo[horas_sol:].sum()]]),
+        np.concatenate([hi, [hi[:horas_sol].sum(), hi[horas_sol:].sum()]]))
+    suma_factor = np.zeros(horas_sol)
+    suma_energia = np.zeros(2 * horas_sol)
+
+    filas = max(1, ENSEMBLE_CHUNK_CELLS // max(horas_sol, 1))
+    with stage_timer("ensamble"):
+        for inicio in range(0, num_realizaciones, filas):
+            report_progress(inicio / num_realizaciones, "simulando ensamble")
+            m = min(filas, num_realizaciones - inicio)
+            factor = rng.uniform(*FACTOR_RADIACION, size=(m, horas_sol))
+            energia = np.tile(factor, 2) * escala
+            suma_factor += factor.sum(axis=0)
+            suma_energia += energia.sum(axis=0)
+            boceto.update(np.column_stack([
+                energia, energia[:, :horas_sol].sum(axis=1), energia[:, horas_sol:].sum(axis=1)]))
+
+    media = suma_energia / num_realizaciones
+    p10, p50, p90 = boceto.quantiles(PERCENTILES)
+
+    resultados = []
+    for t in range(horas_sol):
+        f = horas_sol + t
         resultados.append({
             "Hora": int(horas[t]),
-            "Radiación Solar (kWh/m²)": float(radiacion_hora),
-            "Inclinación (θ)": float(theta_opt),
-            "Orientación (φ)": float(phi_opt),
-            "Energía Generada (kWh)": float(energia_hora)
+            "Radiación Esperada (kWh/m²)": float(I_promedio * suma_factor[t] / num_realizaciones),
+            "Inclinación (θ)": float(seguimiento[t][0]),
+            "Orientación (φ)": float(seguimiento[t][1]),
+            "Energía Esperada Seguimiento (kWh)": float(media[t]),
+            "P10 Seguimiento (kWh)": float(p10[t]),
+            "P50 Seguimiento (kWh)": float(p50[t]),
+            "P90 Seguimiento (kWh)": float(p90[t]),
+            "Energía Esperada Fija (kWh)": float(media[f]),
+            "P10 Fija (kWh)": float(p10[f]),
+            "P50 Fija (kWh)": float(p50[f]),
+            "P90 Fija (kWh)": float(p90[f]),
         })
 
-    return resultados, float(energia_total)
+    def bandas(energia_esperada, columna):
+        return {"energia_esperada": float(energia_esperada), "p10": float(p10[columna]),
+                "p50": float(p50[columna]), "p90": float(p90[columna])}
+
+    resumen = {
+        "num_realizaciones": num_realizaciones,
+        "orientacion_fija": {"Inclinación (θ)": float(fija[0]), "Orientación (φ)": float(fija[1])},
+        "seguimiento": bandas(media[:horas_sol].sum(), 2 * horas_sol),
+        "fija": bandas(media[horas_sol:].sum(), 2 * horas_sol + 1),
+    }
+    return resultados, resumen
@@ -7,8 +7,10 @@ Este módulo define la lógica para ejecutar la simulación de Monte Carlo para
 from flask import jsonify
 import numpy as np
 import pandas as pd
+from src.utils.jobs import report_progress
+from src.utils.metrics import stage_timer
 
-def run_monte_carlo_simulation(num_simulaciones, precio_energia_range, produccion_solar_range, consumo_energia_range, impuesto_mensual, region, area_vivienda, consumo_mensual):
+def run_monte_carlo_simulation(num_simulaciones, precio_energia_range, produccion_solar_range, consumo_energia_range, impuesto_mensual, region, area_vivienda, consumo_mensual, seed=None):
     """
     Ejecuta la simulación de Monte Carlo para el ahorro energético basado en los datos proporcionados.
 
@@ -21,6 +23,7 @@ def run_monte_carlo_simulation(num_simulaciones, precio_energia_range, produccio
         region (str): Nombre de la región de la vivienda.
         area_vivienda (float): Área de la vivienda en m².
         consumo_mensual (float): Consumo mensual de la vivienda en kWh.
+        seed (int, optional): Semilla del generador aleatorio para resultados reproducibles.
 
     Returns:
         dict: Resultados de la simulación con estadísticas descriptivas y datos de simulación para graficar.
@@ -35,37 +38,52 @@ def run_monte_carlo_simulation(num_simulaciones, precio_energia_range, produccio
     rois = []
     vpns = []
 
+    # Generador propio (reproducible si se envía 'seed')
+    rng = np.random.default_rng(seed)
+
     # Simulación de Monte Carlo
-    for _ in range(num_simulaciones):
-        # Generar valores aleatorios para las variables
-        precio_energia = np.random.uniform(*precio_energia_range)
-        produccion_solar = np.random.uniform(*produccion_solar_range)
-        consumo_energia = np.random.uniform(*consumo_energia_range)
-
-        # Calcular la energía consumida de la red
-        energia_red = max(0, consumo_energia - produccion_solar)
-
-        # Calcular el costo de la energía consumida de la red
-        costo_energia_red = energia_red * precio_energia
-
-        # Calcular el ahorro anual
-        ahorro_anual = costo_energia_red * 365  # Ahorrar todos los días del año
-
-        # Cálculos adicionales para las métricas solicitadas
-        inversion_inicial = 1000  # Ejemplo: inversión inicial de un sistema solar
-        periodo_recuperacion = inversion_inicial / ahorro_anual
-        roi = (ahorro_anual * 100) / inversion_inicial
-        vpn = ahorro_anual / (1 + 0.05) ** periodo_recuperacion  # Suponiendo una tasa de descuento del 5%
-
-        # Almacenar los resultados de la simulación
-        ahorros_anuales.append(ahorro_anual)
-        precio_energia_simulacion.append(precio_energia)
-        produccion_solar_simulacion.append(produccion_solar)
-        consumo_energia_simulacion.append(consumo_energia)
-        inversiones_iniciales.append(inversion_inicial)
-        periodos_recuperacion.append(periodo_recuperacion)
-        rois.append(roi)
-        vpns.append(vpn)
+    with stage_timer("simulacion"):
+        for i in range(num_simulaciones):
+            # Reportar progreso periódicamente (permite cancelar trabajos asíncronos)
+            if i % 1000 == 0:
+                report_progress(i / num_simulaciones, "simulando")
+
+            # Generar valores aleatorios para las variables
+            precio_energia = rng.uniform(*precio_energia_range)
+            produccion_solar = rng.uniform(*produccion_solar_range)
+            consumo_energia = rng.uniform(*consumo_energia_range)
+
+            # Calcular la energía consumida de la red
+            energia_red = max(0, consumo_energia - produccion_solar)
+
+            # Calcular el costo de la energía consumida de la red
+            costo_energia_red = energia_red * precio_energia
+
+            # Calcular el ahorro anual
+            ahorro_anual = costo_energia_red * 365  # Ahorrar todos los días del año
+
+            # Cálculos adicionales para las métricas solicitadas
+            inversion_inicial = 1000  # Ejemplo: inversión inicial de un sistema solar
+            roi = (ahorro_anual * 100) / inversion_inicial
+            if ahorro_anual > 0:
+                periodo_recuperacion = inversion_inicial / ahorro_anual
+                # Suponiendo una tasa de descuento del 5% (exponente negativo: con ahorros muy pequeños
+                # el factor tiende a cero en lugar de desbordarse)
+                vpn = ahorro_anual * (1 + 0.05) ** -periodo_recuperacion
+            else:
+                # Sin ahorro (la producción cubre el consumo) la inversión no se recupera
+                periodo_recuperacion = np.nan
+                vpn = 0.0
+
+            # Almacenar los resultados de la simulación
+            ahorros_anuales.append(ahorro_anual)
+            precio_energia_simulacion.append(precio_energia)
+            produccion_solar_simulacion.append(produccion_solar)
+            consumo_energia_simulacion.append(consumo_energia)
+            inversiones_iniciales.append(inversion_inicial)
+            periodos_recuperacion.append(periodo_recuperacion)
+            rois.append(roi)
+            vpns.append(vpn)
 
     # Si las variables de simulación son listas, conviértelas a arrays de numpy:
     ahorros_anuales = np.array(ahorros_anuales)
@@ -75,7 +93,8 @@ def run_monte_carlo_simulation(num_simulaciones, precio_energia_range, produccio
 
     # Calcular las estadísticas
     ahorro_promedio = np.mean(ahorros_anuales)
-    periodo_recuperacion_promedio = np.mean(periodos_recuperacion)
+    recuperables = periodos_recuperacion[~np.isnan(periodos_recuperacion)]
+    periodo_recuperacion_promedio = float(np.mean(recuperables)) if recuperables.size else None
     roi_promedio = np.mean(rois)
     vpn_promedio = np.mean(vpns)
     probabilidad_vpn_positivo = np.sum(vpns > 0) / num_simulaciones * 100
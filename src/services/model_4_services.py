@@ -6,86 +6,130 @@ Genera predicciones basadas en datos históricos de consumo, incluyendo un inter
 """
 
 
+import numpy as np
 import pandas as pd
 from statsmodels.tsa.arima.model import ARIMA
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import base64
 from io import BytesIO
 import datetime
 import random
 import logging
+from src.utils.jobs import report_progress
+from src.utils.metrics import stage_timer
 
 # Configurar logger
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def run_prediction(data):
+def forecast_consumption(data):
     """
-    Ejecuta el modelo de predicción de consumo energético basado en los datos proporcionados.
+    Genera el histórico de consumo y ajusta el modelo ARIMA, sin generar el gráfico.
+
+    Es el núcleo de `run_prediction` y permite a otros servicios (por ejemplo, el pipeline de
+    planificación) usar la serie como `np.ndarray` sin pasar por JSON.
 
     Args:
-        data (dict): Parámetros del modelo.
+        data (dict): Parámetros del modelo (ver `run_prediction`).
 
     Returns:
-        dict: Resultados de la predicción.
+        dict:
+            - historico (list[dict]): Consumo diario por electrodoméstico.
+            - serie (np.ndarray): Consumo total diario (kWh).
+            - consumo_predicho (float): Predicción para el día siguiente.
+            - intervalo (tuple[float, float]): Límites inferior y superior de la predicción.
+            - fecha_prediccion (str): Fecha de la predicción (día siguiente al último histórico).
     """
-    try:
-        dias_historicos = data['dias_historicos']
-        orden_arima = tuple(data['orden_arima'])
-        intervalo_confianza = data['intervalo_confianza']
-
-        # Generar datos históricos ficticios
+    dias_historicos = data['dias_historicos']
+    orden_arima = tuple(data['orden_arima'])
+    intervalo_confianza = data['intervalo_confianza']
+    # Generador propio (reproducible si se envía 'seed')
+    rng = random.Random(data.get('seed'))
+
+    # Generar datos históricos ficticios
+    with stage_timer("datos"):
         historico = []
         for i in range(dias_historicos):
             fecha = (datetime.datetime.now(
             ) - datetime.timedelta(days=dias_historicos - i)).strftime('%Y-%m-%d')
-            electrodomesticos = {k: round(random.uniform(
+            electrodomesticos = {k: round(rng.uniform(
                 0.01, 2.5), 2) for k in data['electrodomesticos'].keys()}
             consumo_total = sum(electrodomesticos.values())
             historico.append(
                 {"Fecha": fecha, "Consumo Total (kWh)": consumo_total, **electrodomesticos})
 
-        consumo_energia = [entry["Consumo Total (kWh)"] for entry in historico]
-        serie_temporal = pd.Series(consumo_energia)
+        serie = np.array([entry["Consumo Total (kWh)"] for entry in historico])
 
-        # Ajustar modelo ARIMA sin validación de estacionariedad
-        modelo = ARIMA(serie_temporal, order=orden_arima)
+    # Ajustar modelo ARIMA sin validación de estacionariedad
+    report_progress(0.1, "ajustando ARIMA")
+    with stage_timer("ajuste_arima"):
+        modelo = ARIMA(pd.Series(serie), order=orden_arima)
         modelo_fit = modelo.fit()
 
         prediccion = modelo_fit.get_forecast(steps=1)
-        prediccion_valor = prediccion.predicted_mean.iloc[0]
+        prediccion_valor = float(prediccion.predicted_mean.iloc[0])
         intervalo = prediccion.conf_int(alpha=1 - intervalo_confianza).iloc[0]
 
+    # Corregir fecha de predicción para ser el día siguiente al último histórico
+    ultima_fecha_historico = datetime.datetime.strptime(
+        historico[-1]['Fecha'], '%Y-%m-%d')
+    fecha_prediccion = (ultima_fecha_historico +
+                        datetime.timedelta(days=1)).strftime('%Y-%m-%d')
+
+    return {
+        "historico": historico,
+        "serie": serie,
+        "consumo_predicho": prediccion_valor,
+        "intervalo": (float(intervalo.iloc[0]), float(intervalo.iloc[1])),
+        "fecha_prediccion": fecha_prediccion,
+    }
+
+
+def run_prediction(data):
+    """
+    Ejecuta el modelo de predicción de consumo energético basado en los datos proporcionados.
+
+    Args:
+        data (dict): Parámetros del modelo.
+
+    Returns:
+        dict: Resultados de la predicción.
+    """
+    try:
+        pronostico = forecast_consumption(data)
+        serie_temporal = pronostico["serie"]
+        prediccion_valor = pronostico["consumo_predicho"]
+        intervalo = pronostico["intervalo"]
+
         # Generar gráfico
-        plt.figure(figsize=(10, 5))
-        plt.plot(serie_temporal, label='Consumo Real')
-        plt.plot([len(serie_temporal)], [prediccion_valor],
-                 marker='o', color='red', label='Predicción')
-        plt.fill_between([len(serie_temporal)], intervalo[0],
-                         intervalo[1], color='pink', alpha=0.3, label='Confianza')
-        plt.legend()
-        plt.title('Consumo Real vs Predicción')
-        plt.xlabel('Días')
-        plt.ylabel('Consumo (kWh)')
-        plt.grid(True)
-
-        buffer = BytesIO()
-        plt.savefig(buffer, format='png')
-        buffer.seek(0)
-        imagen_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-        buffer.close()
-
-        # Corregir fecha de predicción para ser el día siguiente al último histórico
-        ultima_fecha_historico = datetime.datetime.strptime(
-            historico[-1]['Fecha'], '%Y-%m-%d')
-        fecha_prediccion = (ultima_fecha_historico +
-                            datetime.timedelta(days=1)).strftime('%Y-%m-%d')
+        report_progress(0.7, "generando gráfico")
+        # Se usa la API orientada a objetos (sin estado global de pyplot) para que varias
+        # predicciones puedan ejecutarse en hilos concurrentes
+        with stage_timer("grafico"):
+            fig = Figure(figsize=(10, 5))
+            ax = fig.subplots()
+            ax.plot(serie_temporal, label='Consumo Real')
+            ax.plot([len(serie_temporal)], [prediccion_valor],
+                    marker='o', color='red', label='Predicción')
+            ax.fill_between([len(serie_temporal)], intervalo[0],
+                            intervalo[1], color='pink', alpha=0.3, label='Confianza')
+            ax.legend()
+            ax.set_title('Consumo Real vs Predicción')
+            ax.set_xlabel('Días')
+            ax.set_ylabel('Consumo (kWh)')
+            ax.grid(True)
+
+            buffer = BytesIO()
+            fig.savefig(buffer, format='png')
+            buffer.seek(0)
+            imagen_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
+            buffer.close()
 
         resultados = {
-            "historico": historico,
+            "historico": pronostico["historico"],
             "prediccion": {
-                "fecha_prediccion": fecha_prediccion,
+                "fecha_prediccion": pronostico["fecha_prediccion"],
                 "consumo_predicho": prediccion_valor,
                 "intervalo_confianza": {"inferior": intervalo[0], "superior": intervalo[1]}
             }
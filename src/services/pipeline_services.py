@@ -0,0 +1,164 @@
+"""
+pipeline_services.py
+
+Este módulo define la lógica del pipeline de planificación ZEH, que encadena en el mismo proceso
+los cuatro modelos sin serializar los resultados intermedios a JSON:
+
+    modulo 4 (consumo) → modulo 1 (dimensionamiento) → modulo 3 (economía)
+    modulo 2 (orientación), en paralelo con la cadena anterior
+
+Variables de entorno:
+    - ZEH_PIPELINE_WORKERS (int): Hilos para las etapas que se ejecutan en paralelo (por defecto 4).
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait
+import os
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.services.model_1_services import run_optimization, screen_sizing
+from src.services.model_2_services import optimize_solar_energy, simulate_solar_ensemble
+from src.services.model_3_services import run_monte_carlo_simulation
+from src.services.model_4_services import forecast_consumption
+from src.utils.executor import run_in_worker
+from src.utils.jobs import bind_job, current_job, report_progress
+from src.utils.metrics import capture_stages, record_stage
+
+# Pool para las etapas independientes (la orientación no depende del resto del pipeline)
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("ZEH_PIPELINE_WORKERS", 4)),
+    thread_name_prefix="zeh-pipeline")
+
+
+def _timed(nombre, tiempos, func, *args, **kwargs):
+    """
+    Ejecuta una etapa (en un proceso de trabajo si el backend está activo) y registra su duración
+    en milisegundos en `tiempos`.
+    """
+    inicio = time.perf_counter()
+    try:
+        return run_in_worker(func, *args, **kwargs)
+    finally:
+        tiempos[nombre] = (time.perf_counter() - inicio) * 1000
+
+
+def _branch(job, nombre, tiempos, func, *args, **kwargs):
+    """
+    Ejecuta una etapa en un hilo de `_executor` y devuelve su resultado junto con las etapas
+    medidas, para registrarlas en el hilo de la solicitud.
+
+    El hilo no hereda los datos por hilo de la solicitud: se le asocia una vista del trabajo que
+    comparte su cancelación, pero no su progreso, que sigue la cadena principal.
+    """
+    vista = None
+    if job is not None:
+        vista = SimpleNamespace(id=job.id, cancel_requested=job.cancel_requested,
+                                progress=0.0, stage=None)
+    with capture_stages() as etapas, bind_job(vista):
+        resultado = _timed(nombre, tiempos, func, *args, **kwargs)
+    return resultado, etapas
+
+
+def run_pipeline(data):
+    """
+    Ejecuta el pipeline completo de planificación.
+
+    Args:
+        data (dict): Parámetros ya validados, con una sección por módulo:
+            - modulo4 (dict): Parámetros de la predicción de consumo (igual que el módulo 4).
+            - modulo1 (dict): Costos y parámetros del dimensionamiento (igual que el módulo 1,
+              sin `K`, `generacion_solar` ni `consumo_energia`, que se derivan del módulo 4).
+            - modulo2 (dict): Parámetros de la orientación (igual que el módulo 2).
+            - modulo3 (dict): Parámetros económicos (igual que el módulo 3, sin
+              `produccion_solar_range` ni `consumo_energia_range`, que se derivan de los
+              módulos 1 y 4).
+            - seed (int, opcional): Semilla aplicada a las secciones que no definen la suya.
+
+    Returns:
+        dict: Resultados de cada etapa (`consumo`, `dimensionamiento`, `orientacion`,
+        `economia`) y la duración de cada una en `tiempos_ms`.
+    """
+    seed = data.get('seed')
+
+    def seccion(nombre):
+        datos = dict(data[nombre])
+        if seed is not None:
+            datos.setdefault('seed', seed)
+        return datos
+
+    tiempos = {}
+    inicio = time.perf_counter()
+
+    # La orientación es independiente: se lanza en paralelo con la cadena 4 → 1 → 3
+    datos_2 = seccion("modulo2")
+    ensamble = datos_2.get('modo') == 'ensamble'
+    futuro_orientacion = _executor.submit(
+        _branch, current_job(), "orientacion", tiempos,
+        simulate_solar_ensemble if ensamble else optimize_solar_energy, datos_2)
+
+    try:
+        # Predicción de consumo: la serie histórica más el día pronosticado
+        report_progress(0.0, "prediccion")
+        pronostico = _timed("prediccion", tiempos, forecast_consumption, seccion("modulo4"))
+        consumo = np.append(pronostico["serie"], pronostico["consumo_predicho"])
+
+        # Dimensionamiento con la serie de consumo pronosticada
+        report_progress(0.3, "dimensionamiento")
+        datos_1 = seccion("modulo1")
+        datos_1["K"] = int(consumo.size)
+        dimensionar = screen_sizing if datos_1.get('modo') == 'cribado' else run_optimization
+        dimensionamiento = _timed("dimensionamiento", tiempos, dimensionar,
+                                  datos_1, consumo_energia=consumo)
+
+        # Economía con los rangos de producción y consumo de las etapas anteriores
+        report_progress(0.7, "economia")
+        produccion = dimensionamiento["Area_Panel_m2"] * \
+            np.asarray(dimensionamiento["Generacion_Solar_kWh_m2"])
+        datos_3 = seccion("modulo3")
+        economia = _timed(
+            "economia", tiempos, run_monte_carlo_simulation,
+            datos_3['num_simulaciones'],
+            tuple(datos_3['precio_energia_range']),
+            (float(produccion.min()), float(produccion.max())),
+            (float(consumo.min()), float(consumo.max())),
+            datos_3['impuesto_mensual'],
+            datos_3['region'],
+            datos_3['area_vivienda'],
+            datos_3['consumo_mensual'],
+            seed=datos_3.get('seed'))
+    finally:
+        # Esperar a la orientación incluso si la cadena falla, para no dejarla huérfana
+        wait([futuro_orientacion])
+
+    report_progress(0.9, "orientacion")
+    resultado_orientacion, etapas = futuro_orientacion.result()
+    for etapa, duracion in etapas:
+        record_stage(etapa, duracion)
+    if ensamble:
+        resultados_orientacion, resumen = resultado_orientacion
+        orientacion = {"resultados": resultados_orientacion,
+                       "energia_total": resumen["seguimiento"]["energia_esperada"],
+                       "ensemble": resumen}
+    else:
+        resultados_orientacion, energia_total = resultado_orientacion
+        orientacion = {"resultados": resultados_orientacion, "energia_total": energia_total}
+
+    tiempos["total"] = (time.perf_counter() - inicio) * 1000
+
+    return {
+        "consumo": {
+            "historico": pronostico["historico"],
+            "prediccion": {
+                "fecha_prediccion": pronostico["fecha_prediccion"],
+                "consumo_predicho": pronostico["consumo_predicho"],
+                "intervalo_confianza": {"inferior": pronostico["intervalo"][0],
+                                        "superior": pronostico["intervalo"][1]}
+            }
+        },
+        "dimensionamiento": dimensionamiento,
+        "orientacion": orientacion,
+        "economia": economia,
+        "tiempos_ms": tiempos,
+    }
@@ -0,0 +1,296 @@
+"""
+admission.py
+
+Este módulo implementa el control de admisión por costo de los endpoints de los modelos.
+
+Cada solicitud recibe un costo estimado a partir del tamaño de su entrada (`K`, `num_simulaciones`,
+`horas_sol`, `dias_historicos`), expresado en unidades: una unidad equivale a la solicitud de
+ejemplo de la colección de Postman. Cada blueprint dispone de un presupuesto de unidades en
+ejecución simultánea; una solicitud que no cabe en el presupuesto disponible espera un tiempo
+breve y, si no llega a admitirse, se rechaza con `503` y la cabecera `Retry-After`. Así una
+solicitud enorme en un módulo no deja sin capacidad al resto, y las solicitudes pequeñas tienen
+una latencia de cola acotada.
+
+Una solicitud síncrona cuyo costo supera todo el presupuesto de su blueprint se rechaza de
+inmediato con `503`, indicando que se envíe como trabajo asíncrono: admitirla ocuparía todo el
+presupuesto durante su ejecución y las solicitudes pequeñas se rechazarían mientras tanto. Los
+trabajos asíncronos pasan por el mismo control, pero esperan sin límite de tiempo en lugar de ser
+rechazados, y los que superan el presupuesto se ejecutan solos (su costo se limita al
+presupuesto).
+
+Variables de entorno:
+    - ZEH_ADMISSION_BUDGET_<MODULO> (float): Presupuesto del blueprint, por ejemplo
+      `ZEH_ADMISSION_BUDGET_MODULO3` (por defecto 4 unidades; 8 para el pipeline, cuya solicitud
+      de ejemplo ya cuesta 4).
+    - ZEH_ADMISSION_MAX_WAIT (float): Segundos máximos de espera en cola (por defecto 2).
+    - ZEH_ADMISSION_MAX_QUEUE (int): Solicitudes en espera admitidas por blueprint (por defecto 16).
+    - ZEH_ADMISSION_RETRY_AFTER (int): Valor de la cabecera `Retry-After` en segundos (por defecto 5).
+"""
+
+from functools import wraps
+import math
+import os
+import threading
+import time
+import logging
+
+from flask import request, jsonify
+
+# Configurar logger
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Costo mínimo de una solicitud, para que muchas solicitudes diminutas también se limiten
+MIN_COST = 0.1
+
+# Fracción del costo del módulo 1 en modo 'cribado' respecto de la resolución exacta
+SCREENING_COST_FACTOR = 0.1
+
+# Realizaciones del ensamble del módulo 2 que equivalen a una unidad de costo
+ENSEMBLE_COST_UNIT = 200_000
+
+# Presupuestos por defecto que difieren de 4 unidades: el pipeline de ejemplo suma una unidad por
+# módulo, así que con 4 cualquier pipeline algo mayor se rechazaría por demasiado costoso
+DEFAULT_BUDGETS = {"pipeline": 8}
+
+# Clave del entorno WSGI con la que los trabajos asíncronos piden esperar sin límite de tiempo
+BACKGROUND_ENVIRON_KEY = "zeh.background"
+
+
+def _escala(data, clave, referencia):
+    """Tamaño de un campo relativo a su valor de referencia (1 si falta o no es válido)."""
+    valor = data.get(clave)
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)) or valor <= 0:
+        return 1.0
+    return valor / referencia
+
+
+def _areas_cribado(data):
+    """Áreas de panel que recorre el cribado (0 a X_max) relativas a las 21 del ejemplo."""
+    x_max = data.get('X_max')
+    if isinstance(x_max, bool) or not isinstance(x_max, (int, float)) or x_max <= 0:
+        return 1.0
+    return (math.floor(x_max) + 1) / 21 if math.isfinite(x_max) else math.inf
+
+
+def _costo_modulo1(data):
+    costo = _escala(data, 'K', 30)
+    if data.get('modo') == 'cribado':
+        # El cribado vectorizado cuesta una fracción de una resolución con CBC, pero sus matrices
+        # crecen con el número de áreas recorridas
+        costo *= SCREENING_COST_FACTOR * _areas_cribado(data)
+    return costo
+
+
+def _costo_modulo2(data):
+    costo = _escala(data, 'horas_sol', 12)
+    if data.get('modo') == 'ensamble':
+        # El ensamble escala con el número de realizaciones × horas
+        costo *= max(1.0, _escala(data, 'num_realizaciones', ENSEMBLE_COST_UNIT))
+    return costo
+
+
+def _costo_modulo3(data):
+    return _escala(data, 'num_simulaciones', 10000)
+
+
+def _costo_modulo4(data):
+    return _escala(data, 'dias_historicos', 30)
+
+
+def _costo_pipeline(data):
+    secciones = {nombre: data.get(nombre) if isinstance(data.get(nombre), dict) else {}
+                 for nombre in ("modulo1", "modulo2", "modulo3", "modulo4")}
+    # En el pipeline, K del módulo 1 es el histórico del módulo 4 más el día pronosticado
+    dias = secciones["modulo4"].get('dias_historicos')
+    modulo1 = dict(secciones["modulo1"], K=dias + 1 if type(dias) is int else None)
+    return (_costo_modulo4(secciones["modulo4"]) + _costo_modulo1(modulo1) +
+            _costo_modulo2(secciones["modulo2"]) + _costo_modulo3(secciones["modulo3"]))
+
+
+# Estimadores de costo por blueprint
+COST_ESTIMATORS = {
+    "modulo1": _costo_modulo1,
+    "modulo2": _costo_modulo2,
+    "modulo3": _costo_modulo3,
+    "modulo4": _costo_modulo4,
+    "pipeline": _costo_pipeline,
+}
+
+
+def estimate_cost(namespace, data):
+    """
+    Estima el costo de una solicitud en unidades.
+
+    Args:
+        namespace (str): Nombre del blueprint ('modulo1' ... 'modulo4', 'pipeline').
+        data (dict): Cuerpo JSON de la solicitud (aún sin validar).
+
+    Returns:
+        float: Costo estimado (al menos `MIN_COST`).
+    """
+    if not isinstance(data, dict):
+        return 1.0
+    return max(MIN_COST, float(COST_ESTIMATORS[namespace](data)))
+
+
+class AdmissionRejected(Exception):
+    """Se lanza cuando una solicitud no se admite dentro del tiempo de espera."""
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class WeightedLimiter:
+    """
+    Semáforo ponderado con cola de espera acotada.
+
+    Las solicitudes en espera se admiten en cuanto su costo cabe en el presupuesto libre, sin
+    esperar a las que están delante, para que una solicitud grande en espera no bloquee a las
+    pequeñas.
+
+    Args:
+        name (str): Nombre del blueprint.
+        budget (float): Unidades de costo en ejecución simultánea.
+        max_wait (float): Segundos máximos de espera.
+        max_queue (int): Solicitudes en espera admitidas a la vez.
+    """
+
+    def __init__(self, name, budget=4.0, max_wait=2.0, max_queue=16):
+        self.name = name
+        self.budget = budget
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.in_use = 0.0
+        self.running = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = {"too_large": 0, "queue_full": 0, "timeout": 0}
+        self._cond = threading.Condition()
+
+    def acquire(self, cost, wait=True):
+        """
+        Reserva presupuesto para una solicitud.
+
+        Args:
+            cost (float): Costo estimado.
+            wait (bool): Si es False, se espera sin límite de tiempo (trabajos asíncronos) y el
+                costo se limita al presupuesto total.
+
+        Returns:
+            float: Costo reservado, que debe devolverse con `release`.
+
+        Raises:
+            AdmissionRejected: Si el costo supera el presupuesto total (solo con `wait`), la cola
+                está llena o se agota el tiempo de espera.
+        """
+        with self._cond:
+            if cost > self.budget:
+                if wait:
+                    self.rejected["too_large"] += 1
+                    raise AdmissionRejected("too_large")
+                cost = self.budget
+            if self.in_use + cost <= self.budget:
+                return self._admit(cost)
+            if wait and self.queued >= self.max_queue:
+                self.rejected["queue_full"] += 1
+                raise AdmissionRejected("queue_full")
+
+            self.queued += 1
+            try:
+                limite = time.monotonic() + self.max_wait if wait else None
+                while self.in_use + cost > self.budget:
+                    restante = None if limite is None else limite - time.monotonic()
+                    if restante is not None and restante <= 0:
+                        self.rejected["timeout"] += 1
+                        raise AdmissionRejected("timeout")
+                    self._cond.wait(restante)
+            finally:
+                self.queued -= 1
+            return self._admit(cost)
+
+    def _admit(self, cost):
+        self.in_use += cost
+        self.running += 1
+        self.admitted += 1
+        return cost
+
+    def release(self, cost):
+        """Devuelve el presupuesto reservado por `acquire`."""
+        with self._cond:
+            self.in_use = max(0.0, self.in_use - cost)
+            self.running -= 1
+            self._cond.notify_all()
+
+    def stats(self):
+        """
+        Devuelve el estado del limitador.
+
+        Returns:
+            dict: Presupuesto, unidades en uso, solicitudes en ejecución y en cola, admitidas y
+            rechazadas por motivo.
+        """
+        with self._cond:
+            return {
+                "budget": self.budget,
+                "in_use": self.in_use,
+                "running": self.running,
+                "queued": self.queued,
+                "admitted": self.admitted,
+                "rejected": dict(self.rejected),
+            }
+
+
+def admission_control(namespace):
+    """
+    Decorador de vistas que aplica el control de admisión del blueprint `namespace`.
+
+    Se coloca debajo de `cached_response`, para que las respuestas servidas desde la caché no
+    consuman presupuesto.
+
+    Args:
+        namespace (str): Nombre del blueprint ('modulo1' ... 'modulo4', 'pipeline').
+
+    Returns:
+        callable: Decorador.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            limiter = limiters[namespace]
+            costo = estimate_cost(namespace, request.get_json(silent=True))
+            try:
+                reservado = limiter.acquire(
+                    costo, wait=not request.environ.get(BACKGROUND_ENVIRON_KEY))
+            except AdmissionRejected as e:
+                logger.warning(f"Solicitud a {namespace} rechazada ({e.reason}), costo {costo:.2f}.")
+                if e.reason == "too_large":
+                    mensaje = ("La solicitud es demasiado costosa para ejecutarse de forma síncrona. "
+                               f"Envíala como trabajo con POST /api/v1/jobs/{namespace}.")
+                else:
+                    mensaje = "El servicio está saturado. Intenta nuevamente más tarde."
+                response = jsonify({"status": "error", "message": mensaje})
+                response.headers['Retry-After'] = str(RETRY_AFTER)
+                return response, 503
+            try:
+                return view(*args, **kwargs)
+            finally:
+                limiter.release(reservado)
+        return wrapper
+    return decorator
+
+
+RETRY_AFTER = int(os.environ.get("ZEH_ADMISSION_RETRY_AFTER", 5))
+
+# Limitadores globales, uno por blueprint
+limiters = {
+    nombre: WeightedLimiter(
+        nombre,
+        budget=float(os.environ.get(f"ZEH_ADMISSION_BUDGET_{nombre.upper()}",
+                                    DEFAULT_BUDGETS.get(nombre, 4))),
+        max_wait=float(os.environ.get("ZEH_ADMISSION_MAX_WAIT", 2)),
+        max_queue=int(os.environ.get("ZEH_ADMISSION_MAX_QUEUE", 16)),
+    )
+    for nombre in COST_ESTIMATORS
+}
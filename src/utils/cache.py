@@ -0,0 +1,279 @@
+"""
+cache.py
+
+Este módulo implementa la caché de respuestas direccionada por contenido para los endpoints de
+los modelos.
+
+Una respuesta solo se almacena cuando la solicitud incluye el campo `seed`, ya que únicamente
+entonces el resultado es determinista. La clave es el hash SHA-256 del cuerpo normalizado
+(claves ordenadas, separadores compactos) junto con el nombre del endpoint. Hay un nivel en
+memoria (LRU con TTL) y un nivel opcional en disco que pueden compartir varios procesos.
+
+El nivel en disco se depura al escribir, como mucho una vez cada `DISK_SWEEP_INTERVAL` segundos:
+se eliminan los archivos expirados (y los temporales abandonados) y, si aún quedan más de
+`ZEH_CACHE_DISK_MAX_FILES`, los más antiguos.
+
+Variables de entorno:
+    - ZEH_CACHE_MAX_ENTRIES (int): Entradas máximas del nivel en memoria (por defecto 256).
+    - ZEH_CACHE_TTL (float): Segundos de vida de cada entrada (por defecto 600).
+    - ZEH_CACHE_DIR (str): Directorio del nivel en disco. Si no se define, el nivel se desactiva.
+    - ZEH_CACHE_DISK_MAX_FILES (int): Archivos máximos del nivel en disco (por defecto 10000;
+      0 para no limitarlos).
+"""
+
+from collections import OrderedDict
+from functools import wraps
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import logging
+
+from flask import request, Response
+
+from src.utils.encoding import format_key
+
+# Configurar logger
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Segundos mínimos entre dos depuraciones del nivel en disco
+DISK_SWEEP_INTERVAL = 60.0
+
+
+def canonical_key(namespace, data, extra=None):
+    """
+    Calcula la clave canónica de una solicitud.
+
+    Args:
+        namespace (str): Nombre del endpoint (por ejemplo, 'modulo1').
+        data (dict): Cuerpo JSON de la solicitud.
+        extra (str, optional): Componente adicional de la clave (por ejemplo, la fecha actual).
+
+    Returns:
+        str: Hash SHA-256 en hexadecimal.
+    """
+    normalizado = json.dumps(data, sort_keys=True, separators=(',', ':'),
+                             ensure_ascii=False)
+    contenido = f"{namespace}|{extra or ''}|{normalizado}"
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Caché de respuestas serializadas con un nivel LRU en memoria y un nivel opcional en disco.
+
+    Args:
+        max_entries (int): Número máximo de entradas en memoria.
+        ttl (float): Segundos de vida de cada entrada.
+        directory (str, optional): Directorio del nivel en disco.
+        max_disk_files (int): Archivos máximos en disco (0 para no limitarlos).
+    """
+
+    def __init__(self, max_entries=256, ttl=600.0, directory=None, max_disk_files=10000):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.directory = directory
+        self.max_disk_files = max_disk_files
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        """
+        Busca una respuesta en la caché.
+
+        Returns:
+            bytes | None: Cuerpo serializado o None si no existe o expiró.
+        """
+        ahora = time.time()
+        with self._lock:
+            entrada = self._entries.get(key)
+            if entrada is not None:
+                expira, cuerpo = entrada
+                if expira > ahora:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return cuerpo
+                del self._entries[key]
+
+        cuerpo = self._disk_get(key, ahora)
+        with self._lock:
+            if cuerpo is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, cuerpo, ahora)
+        return cuerpo
+
+    def set(self, key, cuerpo):
+        """
+        Almacena una respuesta serializada en ambos niveles.
+
+        Args:
+            key (str): Clave canónica.
+            cuerpo (bytes): Cuerpo JSON serializado.
+        """
+        with self._lock:
+            self._store(key, cuerpo, time.time())
+        self._disk_set(key, cuerpo)
+
+    def clear(self):
+        """Vacía el nivel en memoria y reinicia los contadores."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self):
+        """
+        Devuelve los contadores de la caché.
+
+        Returns:
+            dict: Aciertos, fallos, tamaño y configuración.
+        """
+        with self._lock:
+            consultas = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits + self.disk_hits) / consultas if consultas else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "disk": bool(self.directory),
+            }
+
+    def _store(self, key, cuerpo, ahora):
+        self._entries[key] = (ahora + self.ttl, cuerpo)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _disk_get(self, key, ahora):
+        if not self.directory:
+            return None
+        ruta = self._disk_path(key)
+        try:
+            if os.path.getmtime(ruta) + self.ttl <= ahora:
+                os.remove(ruta)
+                return None
+            with open(ruta, 'rb') as archivo:
+                return archivo.read()
+        except OSError:
+            return None
+
+    def _disk_set(self, key, cuerpo):
+        if not self.directory:
+            return
+        try:
+            # Escritura atómica para que otros procesos nunca lean un archivo incompleto
+            fd, temporal = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as archivo:
+                archivo.write(cuerpo)
+            os.replace(temporal, self._disk_path(key))
+        except OSError as e:
+            logger.error(f"No se pudo escribir la caché en disco: {str(e)}")
+
+        ahora = time.time()
+        with self._lock:
+            if ahora < self._next_sweep:
+                return
+            self._next_sweep = ahora + DISK_SWEEP_INTERVAL
+        self._sweep_disk(ahora)
+
+    def _sweep_disk(self, ahora):
+        """
+        Elimina del directorio los archivos expirados y, si se supera `max_disk_files`, los más
+        antiguos. Otros procesos pueden estar depurando el mismo directorio, así que los archivos
+        que ya no existen se ignoran.
+        """
+        vigentes = []
+        eliminados = 0
+        try:
+            with os.scandir(self.directory) as entradas:
+                for entrada in entradas:
+                    if not entrada.name.endswith(('.json', '.tmp')):
+                        continue
+                    try:
+                        modificado = entrada.stat().st_mtime
+                        if modificado + self.ttl <= ahora:
+                            os.remove(entrada.path)
+                            eliminados += 1
+                        elif entrada.name.endswith('.json'):
+                            vigentes.append((modificado, entrada.path))
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.error(f"No se pudo depurar la caché en disco: {str(e)}")
+            return
+
+        if self.max_disk_files and len(vigentes) > self.max_disk_files:
+            vigentes.sort()
+            for _, ruta in vigentes[:len(vigentes) - self.max_disk_files]:
+                try:
+                    os.remove(ruta)
+                    eliminados += 1
+                except OSError:
+                    continue
+        if eliminados:
+            logger.info(f"Caché en disco depurada: {eliminados} archivos eliminados.")
+
+
+def cached_response(namespace, key_extra=None):
+    """
+    Decorador de vistas que sirve desde la caché las solicitudes con `seed`.
+
+    Solo se almacenan las respuestas con código 200. Las solicitudes sin `seed` (o con un `seed`
+    que no sea un entero) se ejecutan siempre.
+
+    Args:
+        namespace (str): Nombre del endpoint usado en la clave.
+        key_extra (callable, optional): Función que devuelve un componente adicional de la clave,
+            para respuestas que dependen de algo más que el cuerpo (por ejemplo, la fecha).
+
+    Returns:
+        callable: Decorador.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            data = request.get_json(silent=True)
+            if not isinstance(data, dict) or type(data.get('seed')) is not int:
+                return view(*args, **kwargs)
+
+            # El formato de respuesta negociado también forma parte de la clave
+            extra = format_key() + (f"|{key_extra()}" if key_extra else "")
+            key = canonical_key(namespace, data, extra)
+            cuerpo = response_cache.get(key)
+            if cuerpo is not None:
+                response = Response(cuerpo, status=200, mimetype='application/json')
+                response.headers['X-Cache'] = 'HIT'
+                return response, 200
+
+            response, status_code = view(*args, **kwargs)
+            if status_code == 200:
+                response_cache.set(key, response.get_data())
+            response.headers['X-Cache'] = 'MISS'
+            return response, status_code
+        return wrapper
+    return decorator
+
+
+# Instancia global de la caché de respuestas
+response_cache = ResponseCache(
+    max_entries=int(os.environ.get("ZEH_CACHE_MAX_ENTRIES", 256)),
+    ttl=float(os.environ.get("ZEH_CACHE_TTL", 600)),
+    directory=os.environ.get("ZEH_CACHE_DIR") or None,
+    max_disk_files=int(os.environ.get("ZEH_CACHE_DISK_MAX_FILES", 10000)),
+)
@@ -0,0 +1,151 @@
+"""
+encoding.py
+
+Este módulo implementa el formato de respuesta columnar opcional para las salidas con arreglos
+largos (resultados hora a hora del módulo 2, histórico del módulo 4, series del módulo 1).
+
+El formato se elige con el parámetro de consulta `format` o con la cabecera `Accept`:
+    - `?format=columnar` o `Accept: application/vnd.zeh.columnar+json`
+      Las listas de diccionarios se devuelven como un diccionario de columnas.
+    - `?format=columnar&binary=float32` o `Accept: application/vnd.zeh.columnar+json; binary=float32`
+      Además, las columnas numéricas se empaquetan como buffers base64 little-endian
+      (`float32` o `float64`).
+
+Sin ninguno de ellos la respuesta mantiene el formato JSON habitual.
+
+Una columna empaquetada tiene la forma:
+    {"dtype": "float32", "encoding": "base64", "length": 24, "data": "AAAgQQAAIEE..."}
+"""
+
+import base64
+
+import numpy as np
+from flask import request
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.zeh.columnar+json"
+BINARY_DTYPES = {"float32": "<f4", "float64": "<f8"}
+
+
+def negotiate_format():
+    """
+    Determina el formato de respuesta pedido por el cliente.
+
+    Returns:
+        tuple: (`columnar` (bool), `binary` (str | None)), donde `binary` es 'float32',
+        'float64' o None.
+
+    Raises:
+        ValueError: Si el tipo binario solicitado no es válido.
+    """
+    formato = request.args.get("format")
+    binario = request.args.get("binary")
+    if formato is None:
+        for valor in request.headers.get("Accept", "").split(","):
+            tipo, *parametros = [parte.strip() for parte in valor.split(";")]
+            if tipo == COLUMNAR_MEDIA_TYPE:
+                formato = "columnar"
+                for parametro in parametros:
+                    clave, _, dato = parametro.partition("=")
+                    if clave.strip() == "binary":
+                        binario = dato.strip()
+                break
+
+    if formato != "columnar":
+        return False, None
+    if binario is not None and binario not in BINARY_DTYPES:
+        raise ValueError(
+            f"'binary' debe ser uno de: {', '.join(sorted(BINARY_DTYPES))}.")
+    return True, binario
+
+
+def format_key():
+    """
+    Devuelve una etiqueta del formato negociado, para las claves de la caché de respuestas.
+
+    Returns:
+        str: 'json', 'columnar' o 'columnar-<dtype>'.
+    """
+    try:
+        columnar, binario = negotiate_format()
+    except ValueError:
+        return "invalido"
+    if not columnar:
+        return "json"
+    return f"columnar-{binario}" if binario else "columnar"
+
+
+def pack_array(values, dtype):
+    """
+    Empaqueta una secuencia numérica como buffer base64 little-endian.
+
+    Args:
+        values (list | np.ndarray): Valores numéricos.
+        dtype (str): 'float32' o 'float64'.
+
+    Returns:
+        dict: Columna empaquetada.
+    """
+    arreglo = np.asarray(values, dtype=BINARY_DTYPES[dtype])
+    return {
+        "dtype": dtype,
+        "encoding": "base64",
+        "length": int(arreglo.size),
+        "data": base64.b64encode(arreglo.tobytes()).decode("ascii"),
+    }
+
+
+def _encode_column(values, binario):
+    if binario is None or not values:
+        return values
+    arreglo = np.asarray(values)
+    # Solo se empaquetan columnas enteramente numéricas (sin None, textos ni booleanos)
+    if arreglo.dtype.kind not in "iuf":
+        return values
+    return pack_array(arreglo, binario)
+
+
+def to_columns(records, binario=None):
+    """
+    Convierte una lista de diccionarios en un diccionario de columnas.
+
+    Args:
+        records (list[dict]): Registros con las mismas claves.
+        binario (str, optional): Tipo binario para las columnas numéricas.
+
+    Returns:
+        dict: Columnas por clave, en el orden de claves del primer registro.
+    """
+    if not records:
+        return {}
+    return {clave: _encode_column([registro[clave] for registro in records], binario)
+            for clave in records[0]}
+
+
+def encode_payload(payload, tables=(), arrays=()):
+    """
+    Aplica el formato negociado a una respuesta.
+
+    Args:
+        payload (dict): Respuesta en el formato JSON habitual.
+        tables (iterable[tuple]): Rutas de claves cuyo valor es una lista de diccionarios.
+        arrays (iterable[tuple]): Rutas de claves cuyo valor es una lista numérica.
+
+    Returns:
+        dict: La misma respuesta si el cliente no pidió el formato columnar; en otro caso, una
+        copia con las tablas en columnas, los arreglos empaquetados si se pidió `binary` y la
+        clave `format` con el formato aplicado.
+    """
+    columnar, binario = negotiate_format()
+    if not columnar:
+        return payload
+
+    resultado = dict(payload)
+    for ruta, convertir in ([(r, lambda v: to_columns(v, binario)) for r in tables] +
+                            [(r, lambda v: _encode_column(v, binario)) for r in arrays]):
+        contenedor = resultado
+        for clave in ruta[:-1]:
+            contenedor[clave] = dict(contenedor[clave])
+            contenedor = contenedor[clave]
+        contenedor[ruta[-1]] = convertir(contenedor[ruta[-1]])
+    resultado["format"] = f"columnar-{binario}" if binario else "columnar"
+    return resultado
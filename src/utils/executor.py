@@ -0,0 +1,269 @@
+"""
+executor.py
+
+Este módulo implementa el backend de ejecución en procesos para las llamadas a los servicios de
+los modelos, que son intensivas en CPU (solver CBC, Monte Carlo, ajuste ARIMA).
+
+Con `flask run` o un servidor de hilos, esas llamadas se ejecutan en los hilos de las solicitudes
+y compiten por el GIL. Con el backend activo, cada llamada se envía a un pool de procesos de
+larga duración que ya tienen importados NumPy, SciPy, PuLP y statsmodels, de modo que el
+rendimiento escala con los núcleos disponibles. Cada proceso se reemplaza tras un número
+configurable de tareas para acotar el crecimiento de memoria.
+
+Si un proceso muere (por ejemplo, por el OOM killer o un fallo de segmentación en CBC), el pool
+queda inservible: se descarta, se crea uno nuevo con los procesos ya precalentados y solo fallan
+las llamadas que estaban en curso en el pool roto. Una llamada que encuentra el pool ya roto (el
+proceso murió en reposo) no llegó a ejecutarse, así que se reintenta una vez en el pool nuevo. Los
+reinicios se cuentan en `/metrics`.
+
+Las etapas medidas dentro del proceso de trabajo (`stage_timer`) se devuelven junto con el
+resultado y se registran en la solicitud original, por lo que `Server-Timing` y `/metrics` no
+cambian. Las llamadas hechas desde un trabajo asíncrono comparten con el proceso de trabajo su
+progreso y su marca de cancelación (mediante un `multiprocessing.Manager`), así que
+`report_progress` actualiza el trabajo y lo detiene al cancelarlo igual que en un hilo.
+
+Variables de entorno:
+    - ZEH_WORKER_PROCESSES (int): Procesos de trabajo. Con 0 (por defecto) las llamadas se
+      ejecutan en el hilo de la solicitud, como antes.
+    - ZEH_WORKER_MAX_TASKS (int): Tareas por proceso antes de reemplazarlo (por defecto 200;
+      0 para no reemplazarlos nunca).
+"""
+
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import threading
+import logging
+
+from src.utils.jobs import bind_job, current_job
+from src.utils.metrics import capture_stages, record_stage
+
+# Segundos entre sincronizaciones del progreso y la cancelación de un trabajo en curso
+JOB_SYNC_INTERVAL = 0.2
+
+# Configurar logger
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _warm_worker():
+    """Inicializador de cada proceso: importa las dependencias pesadas y los servicios."""
+    import numpy  # noqa: F401
+    import scipy.optimize  # noqa: F401
+    import pulp  # noqa: F401
+    import statsmodels.tsa.arima.model  # noqa: F401
+    import src.services.model_1_services  # noqa: F401
+    import src.services.model_2_services  # noqa: F401
+    import src.services.model_3_services  # noqa: F401
+    import src.services.model_4_services  # noqa: F401
+
+
+def _ping():
+    return os.getpid()
+
+
+class _SharedJob:
+    """
+    Trabajo visto desde el proceso de trabajo.
+
+    Expone lo que usa `report_progress` (`id`, `cancel_requested`, `progress`, `stage`) sobre
+    objetos del `Manager` compartidos con el proceso principal.
+    """
+
+    def __init__(self, job_id, estado, cancelado):
+        self.id = job_id
+        self.cancel_requested = cancelado
+        self._estado = estado
+
+    @property
+    def progress(self):
+        return self._estado.get("progress", 0.0)
+
+    @progress.setter
+    def progress(self, valor):
+        self._estado["progress"] = valor
+
+    @property
+    def stage(self):
+        return self._estado.get("stage")
+
+    @stage.setter
+    def stage(self, valor):
+        self._estado["stage"] = valor
+
+
+def _call(func, args, kwargs, trabajo=None):
+    """Ejecuta una llamada en el proceso de trabajo y devuelve también sus etapas medidas."""
+    with capture_stages() as etapas, bind_job(trabajo):
+        resultado = func(*args, **kwargs)
+    return resultado, etapas
+
+
+class ProcessBackend:
+    """
+    Pool de procesos de trabajo precalentados.
+
+    Args:
+        processes (int): Número de procesos. Con 0 las llamadas se ejecutan en el hilo actual.
+        max_tasks (int): Tareas por proceso antes de reemplazarlo (0 para no reemplazarlos).
+    """
+
+    def __init__(self, processes=0, max_tasks=200):
+        self.processes = processes
+        self.max_tasks = max_tasks
+        self.restarts = 0
+        self._pool = None
+        self._manager = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.processes > 0
+
+    def start(self):
+        """
+        Crea el pool y espera a que todos los procesos terminen de importar sus dependencias, y
+        arranca el `Manager` de los trabajos asíncronos, para que la primera solicitud o el primer
+        trabajo no paguen ese costo. No hace nada si el backend está desactivado.
+        """
+        if self.enabled:
+            self._ensure_pool()
+            self._ensure_manager()
+
+    def _ensure_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = self._create_pool()
+            return self._pool
+
+    def _create_pool(self):
+        # 'spawn' evita heredar hilos y bloqueos del servidor; es además el contexto que
+        # requiere `max_tasks_per_child`
+        pool = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+            max_tasks_per_child=self.max_tasks or None)
+        # Una tarea por proceso obliga a crearlos e inicializarlos todos ahora
+        wait([pool.submit(_ping) for _ in range(self.processes)])
+        logger.info(f"Pool de {self.processes} procesos de trabajo listo.")
+        return pool
+
+    def _restart(self, roto):
+        """Reemplaza un pool roto. Si otro hilo ya lo reemplazó, no hace nada."""
+        with self._lock:
+            if self._pool is not roto:
+                return
+            self.restarts += 1
+            logger.error("Un proceso de trabajo terminó inesperadamente; se reinicia el pool.")
+            roto.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._pool = self._create_pool()
+
+    def run(self, func, *args, **kwargs):
+        """
+        Ejecuta `func(*args, **kwargs)` en un proceso de trabajo y espera su resultado.
+
+        `func` debe ser una función de nivel de módulo y sus argumentos deben poder serializarse
+        con pickle. Si el backend está desactivado, la llamada se ejecuta en el hilo actual.
+
+        Returns:
+            El resultado de `func`.
+
+        Raises:
+            RuntimeError: Si el proceso de trabajo muere durante la llamada. El pool se reinicia
+                para las llamadas siguientes. Si el pool ya estaba roto al enviarla, la llamada se
+                reintenta una vez en el pool nuevo.
+            Exception: La misma excepción que lance `func` en el proceso de trabajo.
+        """
+        if not self.enabled:
+            return func(*args, **kwargs)
+        job = current_job()
+        trabajo = None
+        if job is not None:
+            manager = self._ensure_manager()
+            estado = manager.dict(progress=job.progress, stage=job.stage)
+            cancelado = manager.Event()
+            if job.cancel_requested.is_set():
+                cancelado.set()
+            trabajo = _SharedJob(job.id, estado, cancelado)
+        pool, futuro = self._submit(func, args, kwargs, trabajo)
+        try:
+            if job is None:
+                resultado, etapas = futuro.result()
+            else:
+                resultado, etapas = self._wait_job_call(futuro, job, estado, cancelado)
+        except BrokenProcessPool:
+            # Una llamada que ya estaba en curso no se reintenta: podría ser ella misma la que
+            # mató al proceso
+            self._restart(pool)
+            raise RuntimeError("El proceso de trabajo terminó inesperadamente.")
+        for etapa, duracion in etapas:
+            record_stage(etapa, duracion)
+        return resultado
+
+    def _submit(self, func, args, kwargs, trabajo=None):
+        """
+        Envía una llamada al pool y devuelve el pool usado y su futuro.
+
+        Raises:
+            RuntimeError: Si el pool sigue roto tras reiniciarlo.
+        """
+        for _ in range(2):
+            pool = self._ensure_pool()
+            try:
+                return pool, pool.submit(_call, func, args, kwargs, trabajo)
+            except BrokenProcessPool:
+                # El pool se rompió antes de esta llamada (un proceso murió en reposo): la llamada
+                # no llegó a ningún proceso, así que se reintenta en el pool nuevo
+                self._restart(pool)
+        raise RuntimeError("El proceso de trabajo terminó inesperadamente.")
+
+    def _wait_job_call(self, futuro, job, estado, cancelado):
+        """
+        Espera una llamada de un trabajo asíncrono y sincroniza periódicamente su progreso (del
+        proceso de trabajo al trabajo) y su cancelación (del trabajo al proceso de trabajo).
+        """
+        while True:
+            terminado = futuro.done() or wait([futuro], timeout=JOB_SYNC_INTERVAL).done
+            if job.cancel_requested.is_set() and not cancelado.is_set():
+                cancelado.set()
+            try:
+                remoto = estado.copy()
+                job.progress = remoto["progress"]
+                job.stage = remoto["stage"]
+            except (OSError, EOFError):
+                pass
+            if terminado:
+                return futuro.result()
+
+    def _ensure_manager(self):
+        with self._lock:
+            if self._manager is None:
+                self._manager = multiprocessing.get_context("spawn").Manager()
+            return self._manager
+
+    def shutdown(self):
+        """Detiene el pool de procesos."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            manager, self._manager = self._manager, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if manager is not None:
+            manager.shutdown()
+
+
+# Backend global de ejecución
+process_backend = ProcessBackend(
+    processes=int(os.environ.get("ZEH_WORKER_PROCESSES", 0)),
+    max_tasks=int(os.environ.get("ZEH_WORKER_MAX_TASKS", 200)),
+)
+
+
+def run_in_worker(func, *args, **kwargs):
+    """
+    Ejecuta una llamada a un servicio con el backend global (ver `ProcessBackend.run`).
+    """
+    return process_backend.run(func, *args, **kwargs)
@@ -0,0 +1,303 @@
+"""
+jobs.py
+
+Este módulo implementa el subsistema de trabajos asíncronos para las soluciones de larga
+duración (MILP del módulo 1, Monte Carlo del módulo 3, ARIMA del módulo 4, etc.).
+
+Los trabajos se ejecutan en un pool acotado de hilos en segundo plano. Cada trabajo recibe un
+identificador único que el cliente utiliza para consultar su progreso, obtener el resultado o
+cancelarlo. Los resultados se conservan en memoria durante un tiempo de vida (TTL) configurable.
+
+Variables de entorno:
+    - ZEH_JOBS_MAX_WORKERS (int): Número de hilos del pool (por defecto 2).
+    - ZEH_JOBS_MAX_PENDING (int): Número máximo de trabajos en cola o en ejecución (por defecto 32).
+    - ZEH_JOBS_RESULT_TTL (float): Segundos que se conserva un trabajo terminado (por defecto 3600).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import os
+import threading
+import time
+import uuid
+import logging
+
+# Configurar logger
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Estados posibles de un trabajo
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = {SUCCEEDED, FAILED, CANCELLED}
+
+# Trabajo asociado al hilo actual (permite reportar progreso desde los servicios)
+_current = threading.local()
+
+
+class JobCancelledError(Exception):
+    """Se lanza dentro de un trabajo cuando el cliente solicitó su cancelación."""
+
+
+class JobQueueFullError(Exception):
+    """Se lanza al enviar un trabajo cuando se alcanzó el límite de trabajos pendientes."""
+
+
+class Job:
+    """
+    Representa un trabajo enviado al pool.
+
+    Attributes:
+        id (str): Identificador único del trabajo.
+        kind (str): Tipo de trabajo (por ejemplo, 'modulo1').
+        state (str): Estado actual del trabajo.
+        progress (float): Progreso entre 0 y 1.
+        stage (str): Descripción de la etapa en curso.
+        result: Resultado del trabajo cuando termina correctamente.
+        error (str): Mensaje de error cuando el trabajo falla.
+    """
+
+    def __init__(self, kind):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.state = QUEUED
+        self.progress = 0.0
+        self.stage = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = threading.Event()
+        self.future = None
+
+    def to_dict(self, include_result=True):
+        """
+        Serializa el trabajo en un diccionario apto para `jsonify`.
+
+        Args:
+            include_result (bool): Si se incluye el resultado del trabajo.
+
+        Returns:
+            dict: Representación del trabajo.
+        """
+        data = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "state": self.state,
+            "progress": round(self.progress, 4),
+            "stage": self.stage,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.error is not None:
+            data["error"] = self.error
+        if include_result and self.state == SUCCEEDED:
+            data["result"] = self.result
+        return data
+
+
+class JobManager:
+    """
+    Administra el pool de trabajos, su registro y la expiración de resultados.
+
+    Args:
+        max_workers (int): Número de hilos que ejecutan trabajos en paralelo.
+        max_pending (int): Número máximo de trabajos sin terminar admitidos a la vez.
+        result_ttl (float): Segundos que se conserva un trabajo después de terminar.
+    """
+
+    def __init__(self, max_workers=2, max_pending=32, result_ttl=3600.0):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="zeh-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, func, *args, **kwargs):
+        """
+        Envía un trabajo al pool.
+
+        Args:
+            kind (str): Tipo de trabajo.
+            func (callable): Función a ejecutar. Su valor de retorno se guarda como resultado.
+
+        Returns:
+            Job: Trabajo creado.
+
+        Raises:
+            JobQueueFullError: Si se alcanzó el límite de trabajos pendientes.
+        """
+        self.purge_expired()
+        job = Job(kind)
+        with self._lock:
+            pending = sum(1 for j in self._jobs.values()
+                          if j.state not in FINISHED_STATES)
+            if pending >= self.max_pending:
+                raise JobQueueFullError(
+                    f"Se alcanzó el límite de {self.max_pending} trabajos pendientes.")
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job, func, args, kwargs)
+        logger.info(f"Trabajo {job.id} ({kind}) encolado.")
+        return job
+
+    def get(self, job_id):
+        """
+        Obtiene un trabajo por su identificador.
+
+        Returns:
+            Job | None: Trabajo encontrado o None si no existe o ya expiró.
+        """
+        self.purge_expired()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """
+        Solicita la cancelación de un trabajo.
+
+        Un trabajo en cola se cancela de inmediato. Un trabajo en ejecución se marca para
+        cancelación y se detiene en el siguiente punto de control (`report_progress`).
+
+        Returns:
+            Job | None: Trabajo afectado o None si no existe.
+        """
+        job = self.get(job_id)
+        if job is None or job.state in FINISHED_STATES:
+            return job
+        job.cancel_requested.set()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, CANCELLED)
+        return job
+
+    def stats(self):
+        """
+        Devuelve el número de trabajos por estado.
+
+        Returns:
+            dict: Conteo de trabajos por estado y configuración del pool.
+        """
+        with self._lock:
+            counts = {state: 0 for state in (
+                QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED)}
+            for job in self._jobs.values():
+                counts[job.state] += 1
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "result_ttl": self.result_ttl,
+            "jobs": counts,
+        }
+
+    def purge_expired(self):
+        """Elimina los trabajos terminados cuyo TTL ya venció."""
+        limite = time.time() - self.result_ttl
+        with self._lock:
+            expirados = [job_id for job_id, job in self._jobs.items()
+                         if job.finished_at is not None and job.finished_at < limite]
+            for job_id in expirados:
+                del self._jobs[job_id]
+
+    def shutdown(self, wait=True):
+        """Detiene el pool de hilos."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _finish(self, job, state, result=None, error=None):
+        job.state = state
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+
+    def _run(self, job, func, args, kwargs):
+        if job.cancel_requested.is_set():
+            self._finish(job, CANCELLED)
+            return
+        job.state = RUNNING
+        job.started_at = time.time()
+        _current.job = job
+        try:
+            result = func(*args, **kwargs)
+            if job.cancel_requested.is_set():
+                self._finish(job, CANCELLED)
+            else:
+                job.progress = 1.0
+                self._finish(job, SUCCEEDED, result=result)
+        except JobCancelledError:
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            if job.cancel_requested.is_set():
+                self._finish(job, CANCELLED)
+            else:
+                logger.error(f"Error en el trabajo {job.id}: {str(e)}")
+                self._finish(job, FAILED, error=str(e))
+        finally:
+            _current.job = None
+            logger.info(f"Trabajo {job.id} terminado con estado '{job.state}'.")
+
+
+def current_job():
+    """
+    Devuelve el trabajo asociado al hilo actual.
+
+    Returns:
+        Job | None: Trabajo en ejecución o None fuera de un trabajo.
+    """
+    return getattr(_current, "job", None)
+
+
+@contextmanager
+def bind_job(job):
+    """
+    Asocia un trabajo al hilo actual durante un bloque.
+
+    Lo usa el backend de procesos para que `report_progress` funcione dentro de los procesos de
+    trabajo con un objeto que comparte el progreso y la cancelación con el proceso principal.
+
+    Args:
+        job: Objeto con `id`, `cancel_requested` (evento), `progress` y `stage`, o None.
+    """
+    anterior = getattr(_current, "job", None)
+    _current.job = job
+    try:
+        yield
+    finally:
+        _current.job = anterior
+
+
+def report_progress(progress, stage=None):
+    """
+    Reporta el progreso del trabajo que se ejecuta en el hilo actual.
+
+    Fuera de un trabajo no hace nada, por lo que los servicios pueden llamarla sin importar
+    si se ejecutan de forma síncrona o asíncrona.
+
+    Args:
+        progress (float): Progreso entre 0 y 1.
+        stage (str, optional): Descripción de la etapa en curso.
+
+    Raises:
+        JobCancelledError: Si el cliente solicitó la cancelación del trabajo.
+    """
+    job = getattr(_current, "job", None)
+    if job is None:
+        return
+    if job.cancel_requested.is_set():
+        raise JobCancelledError(f"Trabajo {job.id} cancelado.")
+    job.progress = min(max(float(progress), 0.0), 1.0)
+    if stage is not None:
+        job.stage = stage
+
+
+# Instancia global del administrador de trabajos
+job_manager = JobManager(
+    max_workers=int(os.environ.get("ZEH_JOBS_MAX_WORKERS", 2)),
+    max_pending=int(os.environ.get("ZEH_JOBS_MAX_PENDING", 32)),
+    result_ttl=float(os.environ.get("ZEH_JOBS_RESULT_TTL", 3600)),
+)
@@ -0,0 +1,244 @@
+"""
+metrics.py
+
+Este módulo implementa la instrumentación de latencia por etapas de la API.
+
+Cada solicitud registra el tiempo de sus etapas (parseo del JSON, validación, construcción del
+modelo, solver, ajuste ARIMA, gráfico, `jsonify`, etc.). Los tiempos se agregan en histogramas
+expuestos en formato de texto de Prometheus en `/metrics` y se devuelven también en la cabecera
+`Server-Timing` de cada respuesta.
+
+Uso en los servicios:
+    with stage_timer("solver"):
+        modelo.solve()
+"""
+
+from contextlib import contextmanager
+import threading
+import time
+
+from flask import request
+
+# Límites superiores (segundos) de los buckets de los histogramas
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                   0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Etapas de la solicitud en curso en el hilo actual
+_current = threading.local()
+
+
+class Histogram:
+    """
+    Histograma acumulativo con etiquetas, compatible con el formato de texto de Prometheus.
+
+    Args:
+        name (str): Nombre de la métrica.
+        documentation (str): Descripción de la métrica.
+        label_names (tuple[str]): Nombres de las etiquetas.
+        buckets (tuple[float]): Límites superiores de los buckets.
+    """
+
+    def __init__(self, name, documentation, label_names, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        """
+        Registra una observación.
+
+        Args:
+            value (float): Valor observado (segundos).
+            label_values: Valores de las etiquetas, en el orden de `label_names`.
+        """
+        with self._lock:
+            serie = self._series.get(label_values)
+            if serie is None:
+                serie = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            for i, limite in enumerate(self.buckets):
+                if value <= limite:
+                    serie[0][i] += 1
+            serie[1] += value
+            serie[2] += 1
+
+    def render(self):
+        """
+        Genera las líneas del histograma en formato de texto de Prometheus.
+
+        Returns:
+            list[str]: Líneas del histograma.
+        """
+        lineas = [f"# HELP {self.name} {self.documentation}",
+                  f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((k, ([*v[0]], v[1], v[2])) for k, v in self._series.items())
+        for label_values, (conteos, suma, total) in series:
+            etiquetas = ",".join(f'{n}="{_escape(v)}"' for n, v in
+                                 zip(self.label_names, label_values))
+            separador = "," if etiquetas else ""
+            for limite, conteo in zip(self.buckets, conteos):
+                lineas.append(
+                    f'{self.name}_bucket{{{etiquetas}{separador}le="{limite}"}} {conteo}')
+            lineas.append(f'{self.name}_bucket{{{etiquetas}{separador}le="+Inf"}} {total}')
+            lineas.append(f"{self.name}_sum{{{etiquetas}}} {suma}")
+            lineas.append(f"{self.name}_count{{{etiquetas}}} {total}")
+        return lineas
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Histogramas globales
+request_duration = Histogram(
+    "zeh_request_duration_seconds", "Duración total de las solicitudes HTTP.",
+    ("endpoint", "method", "status"))
+stage_duration = Histogram(
+    "zeh_stage_duration_seconds", "Duración de cada etapa de las solicitudes.",
+    ("endpoint", "stage"))
+
+# Proveedores de métricas adicionales (funciones que devuelven líneas de texto)
+_collectors = []
+
+
+def register_collector(collector):
+    """
+    Registra una función que devuelve líneas adicionales para `/metrics`.
+
+    Args:
+        collector (callable): Función sin argumentos que devuelve `list[str]`.
+    """
+    _collectors.append(collector)
+
+
+def _endpoint():
+    return getattr(_current, "endpoint", None) or "interno"
+
+
+def _record(stage, duracion):
+    # Las etapas recolectadas con `capture_stages` se agregan al histograma al registrarlas en la
+    # solicitud original, con su endpoint
+    if not getattr(_current, "capturing", False):
+        stage_duration.observe(duracion, _endpoint(), stage)
+    etapas = getattr(_current, "stages", None)
+    if etapas is not None:
+        etapas.append((stage, duracion))
+        _current.last_mark = time.perf_counter()
+
+
+@contextmanager
+def stage_timer(stage):
+    """
+    Mide la duración de un bloque como una etapa de la solicitud en curso.
+
+    Fuera de una solicitud la duración se agrega igualmente al histograma con el endpoint
+    'interno'.
+
+    Args:
+        stage (str): Nombre de la etapa (solo caracteres ASCII, se usa en `Server-Timing`).
+    """
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(stage, time.perf_counter() - inicio)
+
+
+def mark_stage(stage):
+    """
+    Registra como etapa el tiempo transcurrido desde la última etapa medida.
+
+    Útil para tramos de código sin un bloque propio, como la validación en las rutas. No hace nada
+    si no hay una etapa previa de referencia en el hilo actual.
+
+    Args:
+        stage (str): Nombre de la etapa.
+    """
+    ultima = getattr(_current, "last_mark", None)
+    if ultima is not None:
+        _record(stage, time.perf_counter() - ultima)
+
+
+def record_stage(stage, duracion):
+    """
+    Registra una etapa medida en otro lugar (por ejemplo, en un proceso de trabajo).
+
+    Args:
+        stage (str): Nombre de la etapa.
+        duracion (float): Duración en segundos.
+    """
+    _record(stage, duracion)
+
+
+@contextmanager
+def capture_stages():
+    """
+    Recolecta las etapas medidas en el hilo actual fuera de una solicitud.
+
+    Lo usan los procesos de trabajo y los hilos auxiliares del pipeline para devolver sus etapas
+    al hilo que atiende la solicitud, que las registra con `record_stage`. Mientras tanto no se
+    agregan al histograma, para no contarlas dos veces.
+
+    Yields:
+        list[tuple]: Lista que se completa con pares `(etapa, segundos)`.
+    """
+    etapas = _current.stages = []
+    _current.last_mark = time.perf_counter()
+    _current.capturing = True
+    try:
+        yield etapas
+    finally:
+        _current.stages = _current.last_mark = None
+        _current.capturing = False
+
+
+def render_metrics():
+    """
+    Genera el cuerpo completo de `/metrics` en formato de texto de Prometheus.
+
+    Returns:
+        str: Métricas serializadas.
+    """
+    lineas = request_duration.render() + stage_duration.render()
+    for collector in _collectors:
+        lineas.extend(collector())
+    return "\n".join(lineas) + "\n"
+
+
+def _before_request():
+    _current.start = time.perf_counter()
+    _current.last_mark = _current.start
+    _current.stages = []
+    _current.endpoint = request.url_rule.rule if request.url_rule else "desconocido"
+    if request.is_json:
+        # Parsear una sola vez; Flask guarda el resultado para `request.get_json()` en la vista
+        with stage_timer("parseo"):
+            request.get_json(silent=True)
+
+
+def _after_request(response):
+    inicio = getattr(_current, "start", None)
+    if inicio is None:
+        return response
+    total = time.perf_counter() - inicio
+    request_duration.observe(total, _current.endpoint, request.method,
+                             str(response.status_code))
+    partes = [f"{stage};dur={duracion * 1000:.3f}" for stage, duracion in _current.stages]
+    partes.append(f"total;dur={total * 1000:.3f}")
+    response.headers['Server-Timing'] = ", ".join(partes)
+    _current.start = _current.last_mark = _current.stages = _current.endpoint = None
+    return response
+
+
+def init_metrics(app):
+    """
+    Registra los hooks de instrumentación en la aplicación Flask.
+
+    Args:
+        app (Flask): Aplicación Flask.
+    """
+    app.before_request(_before_request)
+    app.after_request(_after_request)
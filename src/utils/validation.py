@@ -0,0 +1,277 @@
+"""
+validation.py
+
+Este módulo implementa la capa de validación de solicitudes compartida por todos los blueprints.
+
+Cada endpoint declara un único esquema (`Schema`) con una regla por campo. El esquema se compila
+una sola vez al importar la ruta: se precalculan las claves requeridas y la lista ordenada de
+validadores, de modo que validar una solicitud solo recorre esa lista. Los arreglos numéricos se
+validan convirtiéndolos a NumPy en una sola pasada, en lugar de revisar elemento por elemento.
+
+También incluye `summarize_payload`, que genera un resumen de tamaño acotado del JSON recibido
+para los logs (los arreglos se resumen por su longitud en lugar de registrarse completos).
+"""
+
+import numpy as np
+
+# Tipos numéricos aceptados (los booleanos se excluyen aparte, aunque hereden de int)
+_NUMEROS = (int, float)
+
+
+class ValidationError(ValueError):
+    """Se lanza cuando una solicitud no cumple su esquema."""
+
+
+class _Invalid(Exception):
+    """Señal interna de un validador; el esquema la convierte en `ValidationError`."""
+
+
+def _es_numero(valor):
+    return isinstance(valor, _NUMEROS) and not isinstance(valor, bool)
+
+
+def integer(minimum=None):
+    """
+    Regla para enteros (se excluyen los booleanos).
+
+    Args:
+        minimum (int, optional): Valor mínimo permitido (inclusive).
+    """
+    def check(valor):
+        if type(valor) is not int or (minimum is not None and valor < minimum):
+            raise _Invalid
+        return valor
+    return check
+
+
+def number(exclusive_minimum=None, minimum=None, strict_float=False, exclusive_maximum=None):
+    """
+    Regla para números (enteros o flotantes, sin booleanos).
+
+    Args:
+        exclusive_minimum (float, optional): El valor debe ser mayor que este límite.
+        minimum (float, optional): El valor debe ser mayor o igual que este límite.
+        strict_float (bool): Si solo se aceptan flotantes.
+        exclusive_maximum (float, optional): El valor debe ser menor que este límite.
+    """
+    def check(valor):
+        if strict_float and not isinstance(valor, float):
+            raise _Invalid
+        if not _es_numero(valor):
+            raise _Invalid
+        if exclusive_minimum is not None and valor <= exclusive_minimum:
+            raise _Invalid
+        if minimum is not None and valor < minimum:
+            raise _Invalid
+        if exclusive_maximum is not None and valor >= exclusive_maximum:
+            raise _Invalid
+        return valor
+    return check
+
+
+def string(non_empty=True):
+    """Regla para cadenas de texto."""
+    def check(valor):
+        if not isinstance(valor, str) or (non_empty and not valor.strip()):
+            raise _Invalid
+        return valor
+    return check
+
+
+def boolean():
+    """Regla para valores booleanos."""
+    def check(valor):
+        if not isinstance(valor, bool):
+            raise _Invalid
+        return valor
+    return check
+
+
+def one_of(*values):
+    """Regla para valores dentro de un conjunto fijo de opciones."""
+    opciones = frozenset(values)
+
+    def check(valor):
+        if not isinstance(valor, str) or valor not in opciones:
+            raise _Invalid
+        return valor
+    return check
+
+
+def mapping(values=None):
+    """
+    Regla para diccionarios.
+
+    Args:
+        values (callable, optional): Regla aplicada a cada valor del diccionario.
+    """
+    def check(valor):
+        if not isinstance(valor, dict):
+            raise _Invalid
+        if values is not None:
+            for dato in valor.values():
+                values(dato)
+        return valor
+    return check
+
+
+def integer_list(length=None):
+    """Regla para listas de enteros, opcionalmente de longitud fija."""
+    def check(valor):
+        if not isinstance(valor, list) or (length is not None and len(valor) != length):
+            raise _Invalid
+        if not all(type(v) is int for v in valor):
+            raise _Invalid
+        return valor
+    return check
+
+
+def number_array(length=None, finite=True):
+    """
+    Regla para listas numéricas. Convierte la lista a `np.ndarray` (float64) en una sola pasada.
+
+    Args:
+        length (int, optional): Longitud exacta requerida.
+        finite (bool): Si se rechazan valores no finitos.
+    """
+    def check(valor):
+        if not isinstance(valor, list):
+            raise _Invalid
+        if not valor:
+            arreglo = np.empty(0)
+        else:
+            arreglo = np.array(valor)
+            # Textos, None u objetos producen un dtype no numérico; los booleanos se rechazan
+            if arreglo.ndim != 1 or arreglo.dtype.kind not in "iuf":
+                raise _Invalid
+            arreglo = arreglo.astype(np.float64, copy=False)
+            if finite and not np.isfinite(arreglo).all():
+                raise _Invalid
+        if length is not None and arreglo.size != length:
+            raise _Invalid
+        return arreglo
+    return check
+
+
+def number_pair():
+    """Regla para rangos `[mínimo, máximo]` de dos números con mínimo <= máximo."""
+    def check(valor):
+        if not isinstance(valor, list) or len(valor) != 2 or not all(_es_numero(v) for v in valor):
+            raise _Invalid
+        if valor[0] > valor[1]:
+            raise _Invalid
+        return valor
+    return check
+
+
+SEED_RULE = (integer(minimum=0), "'seed' debe ser un entero no negativo.")
+
+
+class Schema:
+    """
+    Esquema declarativo de una solicitud.
+
+    Args:
+        required (dict): Reglas de los campos obligatorios, `{campo: (regla, mensaje)}`.
+        optional (dict, optional): Reglas de los campos opcionales con la misma forma.
+
+    El orden de los diccionarios define el orden en que se validan los campos.
+    """
+
+    def __init__(self, required, optional=None):
+        optional = {"seed": SEED_RULE, **(optional or {})}
+        # Compilación: claves requeridas y validadores en orden, calculados una sola vez
+        self.required_keys = frozenset(required)
+        self._required = tuple((clave, regla, mensaje)
+                               for clave, (regla, mensaje) in required.items())
+        self._optional = tuple((clave, regla, mensaje)
+                               for clave, (regla, mensaje) in optional.items())
+
+    def without(self, *keys):
+        """
+        Deriva un esquema sin algunos campos obligatorios (por ejemplo, los que calcula otro
+        servicio en el pipeline de planificación).
+
+        Args:
+            keys (str): Campos a excluir.
+
+        Returns:
+            Schema: Nuevo esquema compilado.
+        """
+        return Schema(
+            required={c: (r, m) for c, r, m in self._required if c not in keys},
+            optional={c: (r, m) for c, r, m in self._optional if c not in keys},
+        )
+
+    def validate(self, data):
+        """
+        Valida una solicitud.
+
+        Args:
+            data (dict): JSON recibido.
+
+        Returns:
+            dict: Copia de `data` con los valores normalizados (por ejemplo, los arreglos
+            numéricos convertidos a `np.ndarray`). Los campos desconocidos se conservan.
+
+        Raises:
+            ValidationError: Si falta alguna clave o algún campo no cumple su regla.
+        """
+        if not isinstance(data, dict):
+            raise ValidationError("Solicitud inválida. Asegúrate de enviar un JSON válido.")
+        faltantes = self.required_keys - data.keys()
+        if faltantes:
+            raise ValidationError(f"Faltan claves requeridas: {set(faltantes)}")
+
+        resultado = dict(data)
+        for clave, regla, mensaje in self._required:
+            try:
+                resultado[clave] = regla(data[clave])
+            except (_Invalid, TypeError, ValueError):
+                raise ValidationError(mensaje)
+        for clave, regla, mensaje in self._optional:
+            if clave in data:
+                try:
+                    resultado[clave] = regla(data[clave])
+                except (_Invalid, TypeError, ValueError):
+                    raise ValidationError(mensaje)
+        return resultado
+
+
+def summarize_payload(data, max_items=5, max_length=300):
+    """
+    Genera un resumen de tamaño acotado de un JSON para registrarlo en los logs.
+
+    Las listas largas se resumen por su longitud y sus primeros elementos, y el texto final se
+    recorta a `max_length` caracteres.
+
+    Args:
+        data: JSON recibido.
+        max_items (int): Elementos que se muestran de cada lista o diccionario.
+        max_length (int): Longitud máxima del resumen.
+
+    Returns:
+        str: Resumen del JSON.
+    """
+    def resumir(valor, profundidad):
+        if isinstance(valor, dict):
+            if profundidad > 2:
+                return f"{{...{len(valor)} claves}}"
+            partes = [f"{k!r}: {resumir(v, profundidad + 1)}"
+                      for k, v in list(valor.items())[:max_items * 4]]
+            if len(valor) > max_items * 4:
+                partes.append(f"...+{len(valor) - max_items * 4}")
+            return "{" + ", ".join(partes) + "}"
+        if isinstance(valor, list):
+            if len(valor) <= max_items:
+                return "[" + ", ".join(resumir(v, profundidad + 1) for v in valor) + "]"
+            inicio = ", ".join(resumir(v, profundidad + 1) for v in valor[:max_items])
+            return f"[{inicio}, ...] (len={len(valor)})"
+        if isinstance(valor, str) and len(valor) > 40:
+            return repr(valor[:40] + "...")
+        return repr(valor)
+
+    resumen = resumir(data, 0)
+    if len(resumen) > max_length:
+        resumen = resumen[:max_length] + "..."
+    return resumen